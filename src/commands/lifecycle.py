@@ -658,6 +658,47 @@ class LifecycleCommand:
         print(f"🤖 Automation Status: STOPPED")
 
 
+def execute_command(command: str, args: Optional[List[str]] = None, 
+                    project_path: Optional[str] = None) -> int:
+    """
+    Run a lifecycle command in-process.
+    
+    Args:
+        command: One of start, pause, resume, stop
+        args: Remaining arguments, joined into the pause/stop reason
+        project_path: Path to project directory. Defaults to current directory.
+        
+    Returns:
+        Exit code the command-line interface would use
+    """
+    reason = ' '.join(args) if args else None
+    
+    try:
+        lifecycle_cmd = LifecycleCommand(project_path)
+        
+        if command == "start":
+            lifecycle_cmd.start()
+        elif command == "pause":
+            lifecycle_cmd.pause(reason)
+        elif command == "resume":
+            lifecycle_cmd.resume()
+        elif command == "stop":
+            lifecycle_cmd.stop(reason)
+        else:
+            print(f"❌ Unknown command: {command}")
+            print("Valid commands: start, pause, resume, stop")
+            return 1
+            
+    except LifecycleCommandError as e:
+        print(f"❌ Lifecycle command failed: {e}")
+        return 1
+    except Exception as e:
+        print(f"❌ Unexpected error: {e}")
+        return 1
+        
+    return 0
+
+
 def main():
     """Command-line interface for lifecycle commands."""
     if len(sys.argv) < 2:
@@ -684,33 +725,15 @@ def main():
     for i in range(2 if project_path else 2, len(sys.argv)):
         if not sys.argv[i].startswith('-'):
             reason_args.append(sys.argv[i])
-    reason = ' '.join(reason_args) if reason_args else None
     
     try:
-        lifecycle_cmd = LifecycleCommand(project_path)
-        
-        if command == "start":
-            lifecycle_cmd.start()
-        elif command == "pause":
-            lifecycle_cmd.pause(reason)
-        elif command == "resume":
-            lifecycle_cmd.resume()
-        elif command == "stop":
-            lifecycle_cmd.stop(reason)
-        else:
-            print(f"❌ Unknown command: {command}")
-            print("Valid commands: start, pause, resume, stop")
-            sys.exit(1)
-            
-    except LifecycleCommandError as e:
-        print(f"❌ Lifecycle command failed: {e}")
-        sys.exit(1)
+        exit_code = execute_command(command, reason_args, project_path)
     except KeyboardInterrupt:
         print(f"\n⚠️  Lifecycle command interrupted")
         sys.exit(1)
-    except Exception as e:
-        print(f"❌ Unexpected error: {e}")
-        sys.exit(1)
+        
+    if exit_code:
+        sys.exit(exit_code)
 
 
 if __name__ == "__main__":
@@ -66,10 +66,12 @@ class StateConfig:
     # State file settings
     STATE_FILE_NAME: str = ".project-state.json"
     STATE_FILE_VERSION: str = "1.0.0"
+    LOCK_FILE_SUFFIX: str = ".lock"  # FileLock sidecar, left in place between runs
     
     # File locking
     LOCK_TIMEOUT_SECONDS: float = 5.0
-    LOCK_RETRY_DELAY: float = 0.1
+    LOCK_RETRY_DELAY: float = 0.1  # Longest wait between attempts
+    LOCK_RETRY_INITIAL_DELAY: float = 0.001  # First wait; doubles up to LOCK_RETRY_DELAY
 
 
 class ProjectConfig:
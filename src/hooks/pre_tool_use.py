@@ -25,20 +25,18 @@ except ImportError as e:
     sys.exit(0)
 
 
-def main():
-    """Main hook entry point."""
-    # Parse event from stdin
-    event, error = EventParser.parse_stdin()
-    if error:
-        print(ResponseBuilder.error(error))
-        return
+def handle_event(event):
+    """
+    Evaluate one parsed event against the workflow rules.
     
+    Returns:
+        JSON response string for the event
+    """
     # Validate event data
     is_valid, validation_error = EventValidator.validate_pre_tool_use(event)
     if not is_valid:
         HookLogger.error(f"Invalid event data: {validation_error}")
-        print(ResponseBuilder.error(f"Invalid event data: {validation_error}"))
-        return
+        return ResponseBuilder.error(f"Invalid event data: {validation_error}")
     
     try:
         # Get current working directory
@@ -52,19 +50,16 @@ def main():
             state = state_manager.read()
         except FileNotFoundError:
             # No state file = allow all operations
-            print(ResponseBuilder.allow())
-            return
+            return ResponseBuilder.allow()
         except Exception as e:
             # Other errors - log but allow
             HookLogger.error(f"State read error: {str(e)}")
-            print(ResponseBuilder.allow(f"State read error: {str(e)}"))
-            return
+            return ResponseBuilder.allow(f"State read error: {str(e)}")
             
         # Check if automation is active
         if not state.get('automation_active', False):
             # Automation not active = allow all operations
-            print(ResponseBuilder.allow())
-            return
+            return ResponseBuilder.allow()
             
         # Get current workflow step and tool
         workflow_step = state.get('workflow_step', 'planning')
@@ -97,21 +92,50 @@ def main():
             HookLogger.error(f"Failed to update metrics: {str(e)}")
             # Include warning in response
             if allow:
-                print(ResponseBuilder.allow(f"Warning: metrics update failed - {str(e)}"))
-            else:
-                print(ResponseBuilder.deny(message, suggestions))
-            return
+                return ResponseBuilder.allow(f"Warning: metrics update failed - {str(e)}")
+            return ResponseBuilder.deny(message, suggestions)
         
         # Build and send response
         if allow:
-            print(ResponseBuilder.allow())
-        else:
-            print(ResponseBuilder.deny(message, suggestions))
+            return ResponseBuilder.allow()
+        return ResponseBuilder.deny(message, suggestions)
                 
     except Exception as e:
         # On error, allow operation but log
         HookLogger.error(f"Hook error: {str(e)}")
-        print(ResponseBuilder.error(f"Hook error: {str(e)}"))
+        return ResponseBuilder.error(f"Hook error: {str(e)}")
+
+
+def run_batch():
+    """
+    Handle newline-delimited events from stdin, one response line per event.
+    
+    Lets test harnesses send many events through one hook process.
+    """
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            event = json.loads(line)
+        except json.JSONDecodeError as e:
+            print(ResponseBuilder.error(f"Invalid JSON: {str(e)}"), flush=True)
+            continue
+        print(handle_event(event), flush=True)
+
+
+def main():
+    """Main hook entry point."""
+    if '--batch' in sys.argv[1:]:
+        run_batch()
+        return
+        
+    # Parse event from stdin
+    event, error = EventParser.parse_stdin()
+    if error:
+        print(ResponseBuilder.error(error))
+        return
+    
+    print(handle_event(event))
 
 
 if __name__ == '__main__':
@@ -8,6 +8,8 @@ import re
 from pathlib import Path
 from datetime import datetime, timezone
 
+from .config import state as state_config
+
 
 class ProjectBuilder:
     """Creates standardized project structure for sprint-based development."""
@@ -63,6 +65,9 @@ class ProjectBuilder:
         # Create Claude settings
         self._create_claude_settings()
         
+        # Keep the state lock sidecar out of version control
+        self._create_gitignore()
+        
     def _create_directories(self):
         """Create essential project directories."""
         dirs = ['sprints', '.claude', 'logs', 'docs']
@@ -175,6 +180,24 @@ A sprint-driven development project with automated workflow management.
         settings_path = self.project_path / '.claude' / 'settings.json'
         settings_path.write_text(json.dumps(settings, indent=2))
         
+    def _create_gitignore(self):
+        """Add the state file's lock sidecar to the project .gitignore.
+        
+        FileLock never deletes its sidecar, so without this entry the
+        setup commit and any later `git add .` would pick it up. An
+        existing .gitignore is appended to rather than replaced.
+        """
+        entry = '/' + state_config.STATE_FILE_NAME + state_config.LOCK_FILE_SUFFIX
+        gitignore_path = self.project_path / '.gitignore'
+        
+        existing = gitignore_path.read_text() if gitignore_path.exists() else ''
+        if entry in existing.splitlines():
+            return
+        
+        if existing and not existing.endswith('\n'):
+            existing += '\n'
+        gitignore_path.write_text(existing + entry + '\n')
+        
     def _get_planning_sprint(self):
         return f"""# Sprint 01: Planning - {self.project_name}
 
@@ -7,16 +7,42 @@ project state files with comprehensive error handling and validation.
 
 import json
 import os
+import pickle
 import tempfile
 import shutil
 import fcntl
 import time
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterable, Optional, List
 from pathlib import Path
 
 from .config import state as state_config, messages, workflow as workflow_config
 
+# orjson encodes and decodes in C; fall back to the json module where it is
+# not importable. Processes sharing one state file may use either, e.g. the
+# test CommandExecutor runs hooks with -S (no site-packages) while the CLI
+# has orjson, so _dumps_state keeps both byte-identical
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps_state(state: Dict[str, Any]) -> bytes:
+    """Serialize state to indented, key-sorted UTF-8 JSON."""
+    # Both branches must produce identical bytes, since writers of the same
+    # file can differ in whether orjson is installed
+    if orjson is not None:
+        return orjson.dumps(state, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+    return json.dumps(state, indent=2, sort_keys=True, ensure_ascii=False).encode('utf-8')
+
+
+def _loads_state(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 class StateValidationError(Exception):
     """Raised when state validation fails."""
@@ -24,7 +50,7 @@ class StateValidationError(Exception):
 
 
 class FileLock:
-    """Simple file locking implementation for state file protection."""
+    """Advisory lock on a sidecar file, held with flock for state file protection."""
     
     def __init__(self, file_path: Path, timeout: float = None):
         """
@@ -34,39 +60,35 @@ class FileLock:
             file_path: Path to the file to lock
             timeout: Maximum time to wait for lock (seconds)
         """
-        self.lock_file = Path(str(file_path) + '.lock')
+        self.lock_file = Path(str(file_path) + state_config.LOCK_FILE_SUFFIX)
         self.timeout = timeout or state_config.LOCK_TIMEOUT_SECONDS
         self.lock_fd = None
         
     def __enter__(self):
         """Acquire lock with timeout."""
-        start_time = time.time()
+        # The lock file is never removed: unlinking it on release would let
+        # a waiter lock the orphaned inode while a newcomer locks a new file.
+        # The kernel drops the lock if the holder dies, so no lock goes stale
+        self.lock_fd = os.open(str(self.lock_file), os.O_CREAT | os.O_RDWR, 0o644)
+        
+        deadline = time.monotonic() + self.timeout
+        delay = state_config.LOCK_RETRY_INITIAL_DELAY
         
         while True:
             try:
-                # Try to create lock file exclusively
-                self.lock_fd = os.open(
-                    str(self.lock_file), 
-                    os.O_CREAT | os.O_EXCL | os.O_RDWR
-                )
+                fcntl.flock(self.lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
                 # Lock acquired successfully
                 break
-            except FileExistsError:
-                # Lock file exists, check timeout
-                if time.time() - start_time > self.timeout:
-                    # Check if lock file is stale (older than timeout)
-                    try:
-                        lock_age = time.time() - os.path.getmtime(self.lock_file)
-                        if lock_age > self.timeout * 2:
-                            # Stale lock, remove it
-                            os.unlink(self.lock_file)
-                            continue
-                    except FileNotFoundError:
-                        # Lock was released, try again
-                        continue
+            except BlockingIOError:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    os.close(self.lock_fd)
+                    self.lock_fd = None
                     raise TimeoutError(messages.ERROR_MESSAGES['lock_timeout'].format(timeout=self.timeout))
-                # Wait a bit before retrying
-                time.sleep(state_config.LOCK_RETRY_DELAY)
+                # Back off quickly from a short first wait, since most holders
+                # release within a millisecond
+                time.sleep(min(delay, remaining))
+                delay = min(delay * 2, state_config.LOCK_RETRY_DELAY)
         
         return self
         
@@ -74,13 +96,11 @@ class FileLock:
         """Release lock."""
         if self.lock_fd is not None:
             try:
+                # Closing the descriptor releases the flock
                 os.close(self.lock_fd)
-            except:
-                pass
-            try:
-                os.unlink(self.lock_file)
-            except:
+            except OSError:
                 pass
+            self.lock_fd = None
 
 
 class StateManager:
@@ -101,6 +121,11 @@ class StateManager:
         self.project_path = Path(project_path).resolve()
         self.state_file = self.project_path / state_config.STATE_FILE_NAME
         
+        # Last validated state as a pickle snapshot, with the exact file
+        # content it was parsed from
+        self._cached_bytes = None
+        self._cached_state = None
+        
     def create(self, project_name: str, initial_sprint: str = "01") -> Dict[str, Any]:
         """
         Create initial project state file with default values.
@@ -150,18 +175,17 @@ class StateManager:
         Raises:
             StateValidationError: If state file doesn't exist or is invalid
         """
-        if not self.state_file.exists():
-            raise StateValidationError(f"State file not found: {self.state_file}")
-            
-        # Use file locking for concurrent access protection
-        with FileLock(self.state_file):
-            try:
-                with open(self.state_file, 'r') as f:
-                    state = json.load(f)
-            except (json.JSONDecodeError, IOError) as e:
-                raise StateValidationError(f"Failed to read state file: {e}")
+        # No lock needed: the rename in _write_state_atomic means an open
+        # handle always sees one complete version of the file, old or new
+        data = self._read_state_bytes()
+        
+        # Identical content parses to an identical, already validated state
+        if data == self._cached_bytes:
+            return pickle.loads(self._cached_state)
             
+        state = self._parse_state(data)
         self._validate_state(state)
+        self._cache_state(state, data)
         return state
         
     def update(self, updates: Dict[str, Any]) -> Dict[str, Any]:
@@ -174,24 +198,37 @@ class StateManager:
         Returns:
             Updated state dictionary
             
+        Raises:
+            StateValidationError: If updates are invalid or operation fails
+        """
+        return self.update_batch([updates])
+        
+    def update_batch(self, updates: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Atomically apply several updates with one lock, read and write.
+        
+        Updates are applied in order, so later ones win on shared fields.
+        The result is validated once; if it is invalid nothing is written.
+        
+        Args:
+            updates: Dictionaries of fields to update
+            
+        Returns:
+            Updated state dictionary
+            
         Raises:
             StateValidationError: If updates are invalid or operation fails
         """
         # Use file locking for the entire update operation
         with FileLock(self.state_file):
-            # Re-read state inside lock to ensure consistency
-            if not self.state_file.exists():
-                raise StateValidationError(f"State file not found: {self.state_file}")
-                
-            try:
-                with open(self.state_file, 'r') as f:
-                    current_state = json.load(f)
-            except (json.JSONDecodeError, IOError) as e:
-                raise StateValidationError(f"Failed to read state file: {e}")
+            # Re-read state inside lock to ensure consistency; another
+            # process may have written since this manager last looked
+            current_state = self._parse_state(self._read_state_bytes())
             
             # Apply updates
             updated_state = current_state.copy()
-            updated_state.update(updates)
+            for update in updates:
+                updated_state.update(update)
             updated_state["last_updated"] = datetime.now(timezone.utc).isoformat()
             
             # Validate updated state
@@ -293,9 +330,8 @@ class StateManager:
             
         # Validate backup before restoring
         try:
-            with open(backup_file, 'r') as f:
-                backup_state = json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
+            backup_state = _loads_state(backup_file.read_bytes())
+        except (json.JSONDecodeError, UnicodeDecodeError, IOError) as e:
             raise StateValidationError(f"Failed to read backup file: {e}")
             
         self._validate_state(backup_state)
@@ -350,22 +386,49 @@ class StateManager:
             except (ValueError, AttributeError):
                 raise StateValidationError(f"Invalid timestamp format: {timestamp_field}")
                 
+    def _read_state_bytes(self) -> bytes:
+        """Read the raw state file content."""
+        try:
+            return self.state_file.read_bytes()
+        except FileNotFoundError:
+            raise StateValidationError(f"State file not found: {self.state_file}")
+        except IOError as e:
+            raise StateValidationError(f"Failed to read state file: {e}")
+            
+    def _parse_state(self, data: bytes) -> Dict[str, Any]:
+        """Parse state file content."""
+        try:
+            return _loads_state(data)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            raise StateValidationError(f"Failed to read state file: {e}")
+            
+    def _cache_state(self, state: Dict[str, Any], data: bytes) -> None:
+        """Remember a validated state and the file content it corresponds to."""
+        # Snapshot so callers can mutate what they get back
+        self._cached_state = pickle.dumps(state, pickle.HIGHEST_PROTOCOL)
+        self._cached_bytes = data
+        
     def _write_state_atomic(self, state: Dict[str, Any]) -> None:
         """Write state file atomically to prevent corruption."""
+        self._cached_bytes = None
+        
         # Write to temporary file first
         temp_file = None
         try:
+            # Serialize up front so the file gets a single write
+            data = _dumps_state(state)
+            
             with tempfile.NamedTemporaryFile(
-                mode='w',
+                mode='wb',
                 suffix='.json',
                 dir=self.project_path,
                 delete=False
             ) as f:
-                json.dump(state, f, indent=2, sort_keys=True)
                 temp_file = f.name
+                f.write(data)
                 
-            # Atomic move to final location
-            shutil.move(temp_file, self.state_file)
+            # Atomic rename to final location
+            os.replace(temp_file, self.state_file)
             
         except Exception as e:
             # Clean up temp file on error
@@ -373,6 +436,9 @@ class StateManager:
                 os.unlink(temp_file)
             raise StateValidationError(f"Failed to write state file: {e}")
             
+        # Every caller validates before writing
+        self._cache_state(state, data)
+            
     def _get_current_branch(self) -> Optional[str]:
         """Get current git branch name."""
         try:
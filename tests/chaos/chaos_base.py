@@ -4,6 +4,8 @@ Base class for chaos testing.
 Provides utilities for testing system resilience with unpredictable AI responses.
 """
 
+import asyncio
+import functools
 import unittest
 import time
 import random
@@ -34,6 +36,12 @@ class ChaosTestBase(unittest.TestCase):
     timeouts = 0
     errors = {}
     
+    # AI provider, built on first query by _get_provider()
+    _provider = None
+    
+    # Guards consecutive_failures, which concurrent chaos_query calls update
+    _breaker_lock = threading.Lock()
+    
     @classmethod
     def setUpClass(cls):
         """Set up class-level resources"""
@@ -47,8 +55,15 @@ class ChaosTestBase(unittest.TestCase):
         cls.failure_rate = float(os.getenv('CHAOS_FAILURE_RATE', '0.1'))
         cls.timeout_probability = float(os.getenv('CHAOS_TIMEOUT_PROB', '0.05'))
         
-        # Initialize AI provider
-        cls.ai_provider = cls._initialize_chaos_provider()
+        # Opt-in fail fast for runs against a backend that may be down: after
+        # this many consecutive fully-failed queries, remaining queries and
+        # tests in the class short-circuit. Off by default, since the failures
+        # chaos tests inject on purpose would otherwise skip later tests
+        cls.breaker_threshold = int(os.getenv('CHAOS_BREAKER_THRESHOLD', '0'))
+        cls.consecutive_failures = 0
+        
+        # AI provider is created lazily on first query
+        cls._provider = None
         
         # Track resilience metrics
         cls.total_attempts = 0
@@ -75,14 +90,47 @@ class ChaosTestBase(unittest.TestCase):
         # Wrap provider with chaos functionality
         return ChaosAIProvider(base_provider, cls)
     
+    @classmethod
+    def _get_provider(cls):
+        """Return the chaos provider, initializing it on first use"""
+        if cls._provider is None:
+            cls._provider = cls._initialize_chaos_provider()
+        return cls._provider
+    
     def setUp(self):
         """Set up test-specific resources"""
+        if self._circuit_open():
+            raise unittest.SkipTest(
+                f"Chaos backend unavailable: {self.consecutive_failures} "
+                f"consecutive failed queries"
+            )
+            
         self.start_time = time.time()
         self.test_errors = []
         self.recovery_attempts = []
         
+        # Per-test generator so chaos decisions are reproducible from the seed
+        self.rng = random.Random(self.chaos_seed)
+        
+    def task_rng(self, *key) -> random.Random:
+        """
+        Generator for one concurrently run task.
+        
+        Workers finish in no fixed order, so sharing self.rng between them
+        would hand out its values differently on every run. Seeding from
+        the chaos seed plus a key naming the task keeps each one reproducible.
+        
+        Args:
+            key: Values identifying the task within the test (e.g., its index)
+            
+        Returns:
+            Generator private to that task
+        """
+        return random.Random(':'.join(map(str, (self.chaos_seed, *key))))
+        
     def chaos_query(self, prompt: str, context: Optional[Dict[str, Any]] = None,
-                   max_retries: int = 3, timeout: float = 30.0) -> Dict[str, Any]:
+                   max_retries: int = 3, timeout: float = 30.0,
+                   rng: Optional[random.Random] = None) -> Dict[str, Any]:
         """
         Query AI with chaos injection and retry logic.
         
@@ -91,12 +139,23 @@ class ChaosTestBase(unittest.TestCase):
             context: Optional context
             max_retries: Maximum retry attempts
             timeout: Timeout in seconds
+            rng: Generator for this query's random choices; pass a
+                task_rng() when calling from a worker thread
             
         Returns:
             AI response or error response
         """
         ChaosTestBase.total_attempts += 1
         
+        # Backend considered down, don't spend the timeout budget again
+        if self._circuit_open():
+            return {
+                'type': 'error',
+                'error': 'Circuit open: chaos backend unavailable',
+                'attempts': 0,
+                'errors': []
+            }
+        
         for attempt in range(max_retries):
             try:
                 # Add chaos context
@@ -108,7 +167,7 @@ class ChaosTestBase(unittest.TestCase):
                 
                 # Set timeout
                 response = self._query_with_timeout(
-                    prompt, chaos_context, timeout
+                    prompt, chaos_context, timeout, rng
                 )
                 
                 # Validate response
@@ -120,6 +179,8 @@ class ChaosTestBase(unittest.TestCase):
                             'success': True,
                             'prompt': prompt[:50]
                         })
+                    with self._breaker_lock:
+                        type(self).consecutive_failures = 0
                     return response
                     
             except TimeoutError:
@@ -141,11 +202,12 @@ class ChaosTestBase(unittest.TestCase):
                 
             # Exponential backoff
             if attempt < max_retries - 1:
-                backoff = (2 ** attempt) * random.uniform(0.5, 1.5)
-                time.sleep(backoff)
+                self._sleep_backoff(attempt, base=1.0, cap=4.0, rng=rng)
                 
         # All retries failed
         ChaosTestBase.failed_recoveries += 1
+        with self._breaker_lock:
+            type(self).consecutive_failures += 1
         return {
             'type': 'error',
             'error': 'All retry attempts failed',
@@ -153,14 +215,39 @@ class ChaosTestBase(unittest.TestCase):
             'errors': self.test_errors[-max_retries:]
         }
     
+    def _sleep_backoff(self, attempt: int, base: float = 0.05, cap: float = 1.0,
+                       rng: Optional[random.Random] = None):
+        """
+        Sleep before a retry using exponential backoff with full jitter.
+        
+        Args:
+            attempt: Zero-based number of the attempt that just failed
+            base: Backoff ceiling for the first retry, in seconds
+            cap: Upper bound on the backoff ceiling, in seconds
+            rng: Generator for the jitter; defaults to self.rng
+        """
+        time.sleep((rng or self.rng).uniform(0, min(cap, base * (2 ** attempt))))
+    
+    def _circuit_open(self) -> bool:
+        """Check whether too many consecutive queries have failed"""
+        return self.breaker_threshold > 0 and self.consecutive_failures >= self.breaker_threshold
+    
+    async def _achaos_query(self, prompt: str, context: Optional[Dict[str, Any]] = None,
+                            **kwargs) -> Dict[str, Any]:
+        """Awaitable chaos_query, run on the event loop's default executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(self.chaos_query, prompt, context, **kwargs)
+        )
+    
     def _query_with_timeout(self, prompt: str, context: Dict[str, Any], 
-                           timeout: float) -> Dict[str, Any]:
+                           timeout: float, rng: Optional[random.Random] = None) -> Dict[str, Any]:
         """Query with timeout enforcement"""
         result = {'response': None, 'error': None}
         
         def query_thread():
             try:
-                result['response'] = self.ai_provider.query(prompt, context)
+                result['response'] = type(self)._get_provider().query(prompt, context, rng=rng)
             except Exception as e:
                 result['error'] = e
                 
@@ -189,13 +276,14 @@ class ChaosTestBase(unittest.TestCase):
     
     @contextmanager
     def simulate_network_issues(self, latency_range=(0.1, 2.0), 
-                               packet_loss=0.1):
-        """Context manager to simulate network issues"""
+                               packet_loss=0.1, rng: Optional[random.Random] = None):
+        """Context manager to simulate network issues, drawing from rng when given"""
+        rng = rng or random
         original_latency = self.network_latency
-        self.network_latency = random.uniform(*latency_range)
+        self.network_latency = rng.uniform(*latency_range)
         
         # Simulate packet loss
-        if random.random() < packet_loss:
+        if rng.random() < packet_loss:
             raise ConnectionError("Simulated packet loss")
             
         try:
@@ -302,15 +390,31 @@ class ChaosAIProvider:
         self.base_provider = base_provider
         self.chaos_config = chaos_config
         
-    def query(self, prompt: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Query with chaos injection"""
+    def query(self, prompt: str, context: Optional[Dict[str, Any]] = None,
+              rng: Optional[random.Random] = None) -> Dict[str, Any]:
+        """
+        Query with chaos injection.
+        
+        Args:
+            prompt: The prompt to send
+            context: Optional context, passed through to the base provider
+            rng: Generator for the injected faults; defaults to the module-level
+                one, which only stays reproducible when queries run one at a time
+        """
+        cfg = self.chaos_config
+        rng = rng or random
+        
+        # Fast path: no chaos configured, behave as the base provider
+        if not cfg.simulate_failures and cfg.network_latency <= 0:
+            return self.base_provider.query(prompt, context)
+        
         # Simulate network latency
-        if self.chaos_config.network_latency > 0:
-            time.sleep(random.uniform(0, self.chaos_config.network_latency))
+        if cfg.network_latency > 0:
+            time.sleep(rng.uniform(0, cfg.network_latency))
             
         # Simulate failures
-        if self.chaos_config.simulate_failures:
-            if random.random() < self.chaos_config.failure_rate:
+        if cfg.simulate_failures:
+            if rng.random() < cfg.failure_rate:
                 failure_types = [
                     ConnectionError("Connection refused"),
                     TimeoutError("Request timeout"),
@@ -318,17 +422,17 @@ class ChaosAIProvider:
                     RuntimeError("Internal server error"),
                     json.JSONDecodeError("Invalid JSON", "", 0)
                 ]
-                raise random.choice(failure_types)
+                raise rng.choice(failure_types)
                 
             # Simulate timeout
-            if random.random() < self.chaos_config.timeout_probability:
+            if rng.random() < cfg.timeout_probability:
                 time.sleep(35)  # Exceed typical timeout
                 
         # Get base response
         response = self.base_provider.query(prompt, context)
         
         # Inject response mutations
-        if self.chaos_config.simulate_failures and random.random() < 0.1:
+        if cfg.simulate_failures and rng.random() < 0.1:
             mutations = [
                 # Truncate response
                 lambda r: {**r, 'response': r.get('response', '')[:10]},
@@ -339,9 +443,9 @@ class ChaosAIProvider:
                 # Duplicate fields
                 lambda r: {**r, 'response': r.get('response', '') * 2},
                 # Remove required fields (25% chance)
-                lambda r: {k: v for k, v in r.items() if k != 'type'} if random.random() < 0.25 else r
+                lambda r: {k: v for k, v in r.items() if k != 'type'} if rng.random() < 0.25 else r
             ]
-            mutation = random.choice(mutations)
+            mutation = rng.choice(mutations)
             response = mutation(response)
             
         return response
\ No newline at end of file
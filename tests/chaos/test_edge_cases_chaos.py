@@ -1,20 +1,17 @@
-#!/usr/bin/env python3
 """
 Chaos tests for edge cases and unusual inputs.
 Tests system behavior with extreme, malformed, or unexpected inputs.
 """
 
-import unittest
 import random
+import re
 import string
 import json
-import sys
-import os
 
-# Add parent directory to path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from .chaos_base import ChaosTestBase
 
-from chaos_base import ChaosTestBase
+# Injection markers that must never be echoed back in a response
+_INJECTION_RE = re.compile(r'<script>|DROP TABLE', re.IGNORECASE)
 
 
 class TestEdgeCasesChaos(ChaosTestBase):
@@ -116,9 +113,7 @@ class TestEdgeCasesChaos(ChaosTestBase):
                 if response.get('type') != 'error':
                     resilient_count += 1
                     # Verify response doesn't contain injection
-                    response_str = json.dumps(response)
-                    self.assertNotIn("<script>", response_str)
-                    self.assertNotIn("DROP TABLE", response_str)
+                    self.assertIsNone(_INJECTION_RE.search(str(response)))
                     
             except Exception:
                 # Expected for some inputs
@@ -338,7 +333,3 @@ class TestEdgeCasesChaos(ChaosTestBase):
         
         # Should handle format confusion gracefully
         self.assertGreater(format_handled, len(format_tests) * 0.6)
-
-
-if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
@@ -1,19 +1,13 @@
-#!/usr/bin/env python3
 """
 Chaos tests for timeout resilience.
 Tests system behavior under various timeout conditions.
 """
 
-import unittest
 import time
-import random
-import sys
-import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-# Add parent directory to path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-
-from chaos_base import ChaosTestBase
+from .chaos_base import ChaosTestBase
 
 
 class TestTimeoutResilienceChaos(ChaosTestBase):
@@ -24,7 +18,7 @@ class TestTimeoutResilienceChaos(ChaosTestBase):
         def timeout_operation():
             return self.chaos_query(
                 "Generate a simple function that adds two numbers",
-                context={"force_timeout": random.random() < 0.3},
+                context={"force_timeout": self.rng.random() < 0.3},
                 timeout=5.0
             )
         
@@ -34,7 +28,7 @@ class TestTimeoutResilienceChaos(ChaosTestBase):
     def test_cascading_timeouts(self):
         """Test recovery from cascading timeout failures"""
         consecutive_timeouts = 0
-        max_consecutive = 0
+        streaks = []
         recoveries = 0
         
         for i in range(20):
@@ -58,11 +52,13 @@ class TestTimeoutResilienceChaos(ChaosTestBase):
                     consecutive_timeouts = 0
                 else:
                     consecutive_timeouts += 1
-                    max_consecutive = max(max_consecutive, consecutive_timeouts)
                     
             except Exception:
                 consecutive_timeouts += 1
-                max_consecutive = max(max_consecutive, consecutive_timeouts)
+                
+            streaks.append(consecutive_timeouts)
+        
+        max_consecutive = max(streaks)
         
         # System should recover from timeout cascades
         self.assertGreater(recoveries, 0, "No recovery from timeout cascades")
@@ -91,21 +87,26 @@ class TestTimeoutResilienceChaos(ChaosTestBase):
             }
         ]
         
+        def attempt_operation(op, attempt):
+            """Run one attempt of an operation, returning True on success"""
+            try:
+                response = self.chaos_query(
+                    op["prompt"],
+                    timeout=op["timeout"],
+                    max_retries=1,
+                    rng=self.task_rng(op["name"], attempt)
+                )
+                return response.get('type') != 'error'
+            except Exception:
+                return False
+        
         for op in operations:
-            successes = 0
             attempts = 10
             
-            for _ in range(attempts):
-                try:
-                    response = self.chaos_query(
-                        op["prompt"],
-                        timeout=op["timeout"],
-                        max_retries=1
-                    )
-                    if response.get('type') != 'error':
-                        successes += 1
-                except Exception:
-                    pass
+            # Attempts are independent, so run them all at once
+            with ThreadPoolExecutor(max_workers=attempts) as executor:
+                futures = [executor.submit(attempt_operation, op, i) for i in range(attempts)]
+                successes = sum(1 for future in as_completed(futures) if future.result())
             
             success_rate = successes / attempts
             self.assertGreaterEqual(
@@ -150,16 +151,16 @@ class TestTimeoutResilienceChaos(ChaosTestBase):
         adjustments = 0
         
         for i in range(15):
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
             
             try:
                 response = self.chaos_query(
                     f"Operation {i} with adaptive timeout",
-                    context={"complexity": random.choice(["low", "medium", "high"])},
+                    context={"complexity": self.rng.choice(["low", "medium", "high"])},
                     timeout=adaptive_timeout
                 )
                 
-                response_time = time.time() - start_time
+                response_time = (time.perf_counter_ns() - start_ns) * 1e-9
                 timeout_history.append({
                     "success": True,
                     "time": response_time,
@@ -195,50 +196,32 @@ class TestTimeoutResilienceChaos(ChaosTestBase):
     
     def test_concurrent_timeout_handling(self):
         """Test handling multiple concurrent operations with different timeouts"""
-        import threading
-        
-        results = {
-            "completed": 0,
-            "timed_out": 0,
-            "errors": 0
-        }
-        lock = threading.Lock()
-        
         def concurrent_operation(op_id, timeout):
+            """Run one operation and report its outcome"""
             try:
                 response = self.chaos_query(
                     f"Concurrent operation {op_id}",
                     context={"operation_id": op_id},
-                    timeout=timeout
+                    timeout=timeout,
+                    rng=self.task_rng(op_id)
                 )
                 
-                with lock:
-                    if response.get('type') != 'error':
-                        results["completed"] += 1
-                    else:
-                        results["errors"] += 1
+                if response.get('type') != 'error':
+                    return "completed"
+                return "errors"
                         
             except TimeoutError:
-                with lock:
-                    results["timed_out"] += 1
+                return "timed_out"
             except Exception:
-                with lock:
-                    results["errors"] += 1
-        
-        # Launch concurrent operations
-        threads = []
-        for i in range(10):
-            timeout = random.uniform(1.0, 5.0)
-            thread = threading.Thread(
-                target=concurrent_operation,
-                args=(i, timeout)
-            )
-            threads.append(thread)
-            thread.start()
+                return "errors"
         
-        # Wait for all to complete
-        for thread in threads:
-            thread.join(timeout=10.0)
+        # Launch concurrent operations on a bounded pool
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            futures = [
+                executor.submit(concurrent_operation, i, self.rng.uniform(1.0, 5.0))
+                for i in range(10)
+            ]
+            results = Counter(future.result() for future in futures)
         
         # Should handle concurrent timeouts without system failure
         total = sum(results.values())
@@ -260,11 +243,14 @@ class TestTimeoutResilienceChaos(ChaosTestBase):
             try:
                 # Custom retry logic with timeout tracking
                 for retry in range(3):
+                    if retry > 0:
+                        self._sleep_backoff(retry - 1)
+                        
                     try:
                         response = self.chaos_query(
                             f"Operation with retry attempt {retry}",
                             context={
-                                "fail_first_n": random.randint(0, 2),
+                                "fail_first_n": self.rng.randint(0, 2),
                                 "attempt": i,
                                 "retry": retry
                             },
@@ -272,12 +258,13 @@ class TestTimeoutResilienceChaos(ChaosTestBase):
                             max_retries=1  # Handle retries manually
                         )
                         
+                        success = response.get('type') != 'error'
                         pattern["retries"].append({
                             "retry": retry,
-                            "success": response.get('type') != 'error'
+                            "success": success
                         })
                         
-                        if response.get('type') != 'error':
+                        if success:
                             pattern["final_result"] = "success"
                             break
                             
@@ -306,7 +293,3 @@ class TestTimeoutResilienceChaos(ChaosTestBase):
             if len(p["retries"]) > 1
         ]
         self.assertGreater(len(succeeded_after_retry), 0, "No success after retry")
-
-
-if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
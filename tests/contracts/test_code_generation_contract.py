@@ -4,6 +4,7 @@ Contract tests for code generation AI responses.
 Validates that AI responses for code generation meet the defined contract.
 """
 
+import re
 import unittest
 import sys
 import os
@@ -13,6 +14,9 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from contract_base import ContractTestBase
 
+# Big-O notation, e.g. "O(log n)"
+_COMPLEXITY_RE = re.compile(r"^O\(.+\)$")
+
 
 class TestCodeGenerationContract(ContractTestBase):
     """Test contract compliance for code generation responses"""
@@ -99,24 +103,27 @@ class TestCodeGenerationContract(ContractTestBase):
             self.assertIsInstance(complexity, dict)
             
             if "time" in complexity:
-                self.assertRegex(complexity["time"], r"^O\(.+\)$")
+                self.assertRegex(complexity["time"], _COMPLEXITY_RE)
             if "space" in complexity:
-                self.assertRegex(complexity["space"], r"^O\(.+\)$")
+                self.assertRegex(complexity["space"], _COMPLEXITY_RE)
     
     def test_multi_language_generation_contract(self):
         """Test contract for different programming languages"""
         languages = ["javascript", "python", "java", "go"]
         
-        for lang in languages:
+        responses = [
+            (lang, self.query_ai(
+                f"Write a hello world function in {lang}",
+                context={"language": lang}
+            ))
+            for lang in languages
+        ]
+        
+        # Validate schema for all languages in one pass
+        self.validate_schema_many(responses, "code_generation_schema")
+        
+        for lang, response in responses:
             with self.subTest(language=lang):
-                response = self.query_ai(
-                    f"Write a hello world function in {lang}",
-                    context={"language": lang}
-                )
-                
-                # Validate schema
-                self.validate_schema(response, "code_generation_schema")
-                
                 # Language field should match if present
                 if "language" in response:
                     self.assertEqual(response["language"].lower(), lang.lower())
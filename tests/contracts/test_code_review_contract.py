@@ -13,6 +13,9 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from contract_base import ContractTestBase
 
+_SEVERITIES = frozenset(("critical", "high", "medium", "low", "info"))
+_CATEGORIES = frozenset(("security", "performance", "maintainability", "style", "bug", "design"))
+
 
 class TestCodeReviewContract(ContractTestBase):
     """Test contract compliance for code review responses"""
@@ -45,11 +48,16 @@ def calculate_average(numbers):
         self.assertIsInstance(response["issues"], list)
         
         # Each issue should have required fields
+        fail = self.fail
         for issue in response["issues"]:
-            self.assertIn("severity", issue)
-            self.assertIn("message", issue)
-            self.assertIn(issue["severity"], ["critical", "high", "medium", "low", "info"])
-            self.assertGreater(len(issue["message"]), 5)
+            severity = issue.get("severity")
+            message = issue.get("message")
+            if severity is None or message is None:
+                fail(f"Issue missing severity or message: {issue}")
+            if severity not in _SEVERITIES:
+                fail(f"Invalid issue severity: {severity!r}")
+            if len(message) <= 5:
+                fail(f"Issue message too short: {message!r}")
     
     def test_security_focused_review_contract(self):
         """Test contract for security-focused code review"""
@@ -155,10 +163,10 @@ def calculate_fibonacci(n: int) -> int:
         self.validate_schema(response, "code_review_schema")
         
         # Check categories if present
-        valid_categories = ["security", "performance", "maintainability", "style", "bug", "design"]
+        fail = self.fail
         for issue in response["issues"]:
-            if "category" in issue:
-                self.assertIn(issue["category"], valid_categories)
+            if "category" in issue and issue["category"] not in _CATEGORIES:
+                fail(f"Invalid issue category: {issue['category']!r}")
     
     def test_code_review_with_metrics(self):
         """Test contract when review includes code metrics"""
@@ -94,28 +94,8 @@ class TestProjectSetupContract(ContractTestBase):
             context={"project_type": "go", "project_name": "user-service"}
         )
         
-        # Validate schema first
-        self.validate_schema(response, "project_setup_schema")
-        
-        # Validate specific field types
-        field_types = {
-            "type": str,
-            "commands": list,
-            "explanation": str
-        }
-        self.validate_field_types(response, field_types)
-        
-        # Optional fields if present
-        if "files_to_create" in response:
-            self.assertIsInstance(response["files_to_create"], list)
-            for file in response["files_to_create"]:
-                self.assertIsInstance(file, str)
-                
-        if "directories" in response:
-            self.assertIsInstance(response["directories"], list)
-            
-        if "next_steps" in response:
-            self.assertIsInstance(response["next_steps"], list)
+        # The schema types every required and optional field
+        self.validate_schema(response, "project_setup_schema", force=True)
     
     def test_minimal_project_setup_contract(self):
         """Test contract with minimal valid response"""
@@ -124,12 +104,9 @@ class TestProjectSetupContract(ContractTestBase):
             context={"minimal": True}
         )
         
-        # Even minimal responses must meet base contract
-        self.validate_schema(response, "project_setup_schema")
-        
-        # Verify required fields
-        required_fields = ["type", "commands", "explanation"]
-        self.validate_required_fields(response, required_fields)
+        # Even minimal responses must meet base contract; the schema
+        # requires type, commands and explanation
+        self.validate_schema(response, "project_setup_schema", force=True)
     
     def test_complex_project_setup_contract(self):
         """Test contract with complex project including multiple components"""
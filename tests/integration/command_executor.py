@@ -6,28 +6,302 @@ Provides utilities to execute /user:project:* commands and simulate
 Claude Code tool usage through hooks.
 """
 
+import atexit
+import contextlib
+import functools
+import io
 import json
 import os
+import select
+import signal
 import subprocess
 import sys
+import tempfile
+import threading
+import time
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
 import re
 
+# orjson serializes straight to bytes in C; fall back to the json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Hooks only need the stdlib, so skip site-packages processing at startup
+_HOOK_INTERPRETER = (sys.executable, '-S', '-s')
+
+# Per-stream cap on captured command output; anything beyond is discarded
+_MAX_CAPTURE_BYTES = 1 << 20
+
+# Seconds a warm hook process may take to answer one event
+_HOOK_RESPONSE_TIMEOUT = 10.0
+
+# Trailing stderr bytes quoted when a warm hook process fails
+_HOOK_STDERR_TAIL = 4096
+
+# Placeholders in command markdown that run_user_command fills in
+_PLACEHOLDER_RE = re.compile(
+    r'\$\{ARGUMENTS:-([^}]*)\}|\$ARGUMENTS|\$\(git rev-parse --show-toplevel\)|\$PROJECT_ROOT'
+)
+
+# Commands that src.commands.lifecycle can run without a subprocess
+_INPROC_COMMANDS = frozenset(('start', 'pause', 'resume', 'stop'))
+
+# Executable lines in command markdown look like !`command`
+_BASH_RE = re.compile(r'^!`(.+?)`$', re.MULTILINE)
+
+
+@functools.lru_cache(maxsize=None)
+def _read_commands(path: str, mtime: float) -> Tuple[str, Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Parse a command markdown file, cached until its mtime changes.
+    
+    Args:
+        path: Path to markdown command file
+        mtime: Modification time of the file, part of the cache key
+        
+    Returns:
+        Tuple of (content, bash commands, success message lines)
+    """
+    content = Path(path).read_text(encoding='utf-8', errors='replace')
+    success_lines = tuple(line for line in content.splitlines()
+                          if line.strip() and not line.startswith(('!`', '#', '---')))
+    return content, tuple(_BASH_RE.findall(content)), success_lines
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize to compact JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+
+def _loads(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _hook_env(project_root: Path) -> Dict[str, str]:
+    """Minimal environment for hook processes"""
+    env = {
+        'PATH': os.environ.get('PATH', os.defpath),
+        'PYTHONPATH': str(project_root),
+        # Test directories are throwaway; don't litter them with .pyc files
+        'PYTHONDONTWRITEBYTECODE': '1'
+    }
+    # HOOK_DEBUG turns on hook debug logging (hook_utils, sound_notifier)
+    for name in ('HOME', 'HOOK_DEBUG'):
+        if name in os.environ:
+            env[name] = os.environ[name]
+    return env
+
+
+def _read_capped(stream, limit: int, buf: bytearray):
+    """
+    Drain a pipe to EOF, keeping at most limit bytes.
+    
+    Args:
+        stream: Binary pipe to read
+        limit: Maximum number of bytes to keep
+        buf: Buffer that receives the captured bytes
+    """
+    truncated = False
+    for chunk in iter(lambda: stream.read(65536), b''):
+        room = limit - len(buf)
+        if room > 0:
+            buf += chunk[:room]
+        truncated = truncated or len(chunk) > room
+    stream.close()
+    if truncated:
+        buf += b'\n[output truncated]'
+
+
+class HookServerPool:
+    """Warm hook processes that answer one JSON event per line."""
+    
+    # Hooks that can run as a long-lived --batch process
+    BATCH_HOOKS = frozenset(('pre_tool_use',))
+    
+    def __init__(self, hooks_path: Path, timeout: float = _HOOK_RESPONSE_TIMEOUT):
+        """
+        Initialize HookServerPool.
+        
+        Args:
+            hooks_path: Directory containing the hook scripts
+            timeout: Seconds to wait for each response before the process is restarted
+        """
+        self.hooks_path = hooks_path
+        self.timeout = timeout
+        self._processes: Dict[str, subprocess.Popen] = {}
+        # Per-process stderr, kept in a file so a chatty hook can't fill a pipe
+        self._stderr: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        
+    def _get_process(self, hook_name: str) -> subprocess.Popen:
+        """Return the warm process for a hook, starting it if needed"""
+        process = self._processes.get(hook_name)
+        if process is None or process.poll() is not None:
+            self._discard(hook_name)
+            stderr = tempfile.TemporaryFile()
+            process = subprocess.Popen(
+                [*_HOOK_INTERPRETER, str(self.hooks_path / f'{hook_name}.py'), '--batch'],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=stderr,
+                # Unbuffered, so select() on the pipe sees every pending byte
+                bufsize=0,
+                env=_hook_env(self.hooks_path.parent.parent)
+            )
+            self._processes[hook_name] = process
+            self._stderr[hook_name] = stderr
+        return process
+        
+    def _discard(self, hook_name: str) -> bytes:
+        """
+        Kill a hook's warm process so the next send starts a fresh one.
+        
+        Args:
+            hook_name: Hook script name without .py
+            
+        Returns:
+            The tail of everything the process wrote to stderr
+        """
+        process = self._processes.pop(hook_name, None)
+        stderr = self._stderr.pop(hook_name, None)
+        if process is not None:
+            if process.poll() is None:
+                process.kill()
+            process.wait()
+            for stream in (process.stdin, process.stdout):
+                with contextlib.suppress(OSError):
+                    stream.close()
+        if stderr is None:
+            return b''
+        stderr.seek(0, os.SEEK_END)
+        stderr.seek(max(0, stderr.tell() - _HOOK_STDERR_TAIL))
+        tail = stderr.read()
+        stderr.close()
+        return tail
+        
+    def _read_line(self, process: subprocess.Popen) -> Optional[bytes]:
+        """
+        Read one response line, giving up after self.timeout seconds.
+        
+        Args:
+            process: Warm hook process to read from
+            
+        Returns:
+            The line including its newline, b'' on EOF, or None on timeout
+        """
+        fd = process.stdout.fileno()
+        deadline = time.monotonic() + self.timeout
+        buf = bytearray()
+        while not buf.endswith(b'\n'):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                return None
+            # Responses are one line per event, so nothing past the newline is lost
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                return b''
+            buf += chunk
+        return bytes(buf)
+        
+    def send(self, hook_name: str, payload: bytes) -> bytes:
+        """
+        Send one encoded event to a hook and wait for its response.
+        
+        Args:
+            hook_name: Hook script name without .py (e.g., 'pre_tool_use')
+            payload: Single-line JSON event
+            
+        Returns:
+            The hook's response line
+            
+        Raises:
+            RuntimeError: If the hook process exits or times out without
+                responding; the process is restarted on the next send
+        """
+        with self._lock:
+            process = self._get_process(hook_name)
+            try:
+                process.stdin.write(payload + b'\n')
+                line = self._read_line(process)
+            except BrokenPipeError:
+                line = b''
+            if line:
+                return line
+            
+            stderr = self._discard(hook_name).decode('utf-8', 'replace').strip()
+            if line is None:
+                reason = f"did not respond within {self.timeout}s"
+            else:
+                reason = f"exited with code {process.returncode}"
+        message = f"{hook_name} hook {reason}"
+        if stderr:
+            message += f"; stderr:\n{stderr}"
+        raise RuntimeError(message)
+        
+    def close(self):
+        """Stop every warm hook process"""
+        with self._lock:
+            for process in self._processes.values():
+                try:
+                    process.stdin.close()
+                    process.wait(timeout=5)
+                except (OSError, subprocess.TimeoutExpired):
+                    process.kill()
+            for hook_name in list(self._processes):
+                self._discard(hook_name)
+
+
+# Hook pool shared by every CommandExecutor in this process
+_HOOK_POOL = None
+
+
+def _shared_hook_pool(hooks_path: Path) -> Optional[HookServerPool]:
+    """
+    Return the process-wide hook pool, closed when the process exits.
+    
+    Set COMMAND_EXECUTOR_COLD_HOOKS=1 to start a fresh hook process per call.
+    """
+    global _HOOK_POOL
+    if os.getenv('COMMAND_EXECUTOR_COLD_HOOKS', '0') == '1':
+        return None
+    if _HOOK_POOL is None:
+        _HOOK_POOL = HookServerPool(hooks_path)
+        atexit.register(_HOOK_POOL.close)
+    return _HOOK_POOL
+
 
 class CommandExecutor:
     """Execute user commands and simulate Claude Code interactions."""
     
-    def __init__(self, working_dir: str):
+    def __init__(self, working_dir: str, hook_pool: Optional[HookServerPool] = None,
+                 command_timeout: float = 30.0):
         """
         Initialize CommandExecutor.
         
         Args:
             working_dir: Directory to execute commands in
+            hook_pool: Warm hook processes to use; defaults to the shared pool
+            command_timeout: Seconds a user command may run before it is killed
         """
         self.working_dir = Path(working_dir).resolve()
+        self._state_path = self.working_dir / '.project-state.json'
         self.src_path = Path(__file__).parent.parent.parent / 'src'
         self.commands_path = self.src_path / 'commands'
+        self.hook_pool = hook_pool or _shared_hook_pool(self.src_path / 'hooks')
+        self.command_timeout = command_timeout
+        
+        # Strings reused by every command and hook invocation
+        self._project_root = str(self.src_path.parent)
+        self._hooks_dir = str(self.src_path / 'hooks')
+        self._hook_env = _hook_env(self.src_path.parent)
         
     def run_user_command(self, command: str, args: List[str] = None) -> Tuple[int, str, str]:
         """
@@ -42,101 +316,183 @@ class CommandExecutor:
         """
         # Map command to markdown file
         command_file = self.commands_path / f"{command}.md"
-        if not command_file.exists():
+        try:
+            mtime = command_file.stat().st_mtime
+        except FileNotFoundError:
             return 1, "", f"Command not found: {command}"
         
         # Read markdown file and extract bash commands
-        with open(command_file, 'r') as f:
-            content = f.read()
-            
-        # Extract and execute bash commands
-        # Look for lines starting with !` and ending with `
-        bash_pattern = r'^!`(.+?)`$'
-        commands = re.findall(bash_pattern, content, re.MULTILINE)
+        _, commands, success_lines = _read_commands(str(command_file), mtime)
         
         if not commands:
             return 1, "", "No executable commands found in markdown"
         
-        # Execute commands in sequence
-        combined_stdout = []
-        combined_stderr = []
-        
-        # Build up environment variables that persist across commands
+        # Build up environment variables shared by all commands
         env_vars = os.environ.copy()
         
         # Pre-set PROJECT_ROOT for all commands
-        project_root = str(self.src_path.parent)
+        project_root = self._project_root
         env_vars['PROJECT_ROOT'] = project_root
         
         # Set PYTHONPATH to include both project root and src directory
         # This allows imports like "from src.state_manager import StateManager"
         env_vars['PYTHONPATH'] = f"{project_root}:{str(self.src_path)}"
         
-        for cmd in commands:
-            # Replace arguments if provided
-            if args and '$ARGUMENTS' in cmd:
-                cmd = cmd.replace('$ARGUMENTS', args[0] if args else '')
-                
-            # Replace git command with actual project root
-            if 'git rev-parse --show-toplevel' in cmd:
-                cmd = cmd.replace("$(git rev-parse --show-toplevel)", project_root)
-                cmd = cmd.replace('$(git rev-parse --show-toplevel)', project_root)  # Handle both quote styles
+        # Placeholders filled in before the commands run
+        arg = args[0] if args else None
+        substitutions = {
+            '$(git rev-parse --show-toplevel)': project_root,
+            '$PROJECT_ROOT': project_root
+        }
+        if arg is not None:
+            substitutions['$ARGUMENTS'] = arg
+            
+        def substitute(match):
+            default = match.group(1)
+            if default is not None:
+                # ${ARGUMENTS:-default} takes the argument, else its default
+                return arg or default
+            return substitutions.get(match.group(0), match.group(0))
             
+        script_lines = []
+        for cmd in commands:
             # Handle PROJECT_ROOT variable assignment
             if 'PROJECT_ROOT=' in cmd:
                 # Skip this command since we've pre-set PROJECT_ROOT
                 continue
                 
-            # Replace $PROJECT_ROOT references with actual value
-            if '$PROJECT_ROOT' in cmd:
-                cmd = cmd.replace('$PROJECT_ROOT', project_root)
-                
-            # Replace ${ARGUMENTS:-default} pattern
-            if '${ARGUMENTS' in cmd:
-                if args and args[0]:
-                    # Replace ${ARGUMENTS:-default} with actual argument
-                    cmd = re.sub(r'\$\{ARGUMENTS:-[^}]*\}', args[0], cmd)
-                else:
-                    # Replace ${ARGUMENTS:-default} with default value
-                    cmd = re.sub(r'\$\{ARGUMENTS:-([^}]*)\}', r'\1', cmd)
-                
-            # Execute command
-            try:
-                # Debug: print the command being executed
-                if 'pause_project.py' in cmd or 'resume_project.py' in cmd:
-                    print(f"Debug: Executing command: {cmd}")
-                    print(f"Debug: Working dir: {self.working_dir}")
-                    print(f"Debug: PYTHONPATH: {env_vars.get('PYTHONPATH')}")
+            # Replace every placeholder in a single pass
+            if '$' in cmd:
+                cmd = _PLACEHOLDER_RE.sub(substitute, cmd)
                     
-                result = subprocess.run(
-                    cmd,
-                    shell=True,
-                    cwd=self.working_dir,
-                    capture_output=True,
-                    text=True,
-                    env=env_vars
-                )
+            # Debug: print the command being executed
+            if 'pause_project.py' in cmd or 'resume_project.py' in cmd:
+                print(f"Debug: Executing command: {cmd}")
+                print(f"Debug: Working dir: {self.working_dir}")
+                print(f"Debug: PYTHONPATH: {env_vars.get('PYTHONPATH')}")
                 
-                if result.stdout:
-                    combined_stdout.append(result.stdout)
-                if result.stderr:
-                    combined_stderr.append(result.stderr)
-                    
-                # Stop on first error
-                if result.returncode != 0:
-                    return result.returncode, '\n'.join(combined_stdout), '\n'.join(combined_stderr)
-                    
-            except Exception as e:
-                return 1, '\n'.join(combined_stdout), f"Command execution failed: {e}"
+            # Each command keeps its own subshell, as if run separately,
+            # and the script stops on the first failure
+            script_lines.append(f"(\n{cmd}\n) || exit $?")
+            
+        # Run every command in one shell instead of forking one per command
+        try:
+            process = subprocess.Popen(
+                ['bash', '-c', '\n'.join(script_lines)],
+                cwd=self.working_dir,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                env=env_vars,
+                # Own process group, so a timeout can kill everything it started
+                start_new_session=True
+            )
+        except Exception as e:
+            return 1, "", f"Command execution failed: {e}"
+            
+        # Drain both pipes concurrently into bounded byte buffers, decoded once at return
+        out_buf = bytearray()
+        err_buf = bytearray()
+        readers = [
+            threading.Thread(target=_read_capped, args=(process.stdout, _MAX_CAPTURE_BYTES, out_buf)),
+            threading.Thread(target=_read_capped, args=(process.stderr, _MAX_CAPTURE_BYTES, err_buf))
+        ]
+        for reader in readers:
+            reader.start()
+            
+        timed_out = False
+        try:
+            returncode = process.wait(timeout=self.command_timeout)
+        except subprocess.TimeoutExpired:
+            timed_out = True
+            os.killpg(process.pid, signal.SIGKILL)
+            returncode = process.wait()
+        for reader in readers:
+            reader.join()
+            
+        if timed_out:
+            if err_buf:
+                err_buf += b'\n'
+            err_buf += f"Command timed out after {self.command_timeout}s".encode()
+            
+        # The script exits with the first failing command's code
+        if returncode != 0:
+            return returncode, out_buf.decode('utf-8', 'replace'), err_buf.decode('utf-8', 'replace')
         
         # Add success message from markdown
-        success_lines = [line for line in content.split('\n') 
-                        if not line.startswith('!`') and not line.startswith('#') 
-                        and not line.startswith('---') and line.strip()]
         if success_lines:
-            combined_stdout.extend(success_lines)
+            if out_buf:
+                out_buf += b'\n'
+            out_buf += '\n'.join(success_lines).encode()
+            
+        return 0, out_buf.decode('utf-8', 'replace'), err_buf.decode('utf-8', 'replace')
+        
+    def run_user_command_inproc(self, command: str, args: List[str] = None) -> Tuple[int, str, str]:
+        """
+        Execute a lifecycle command in this process.
+        
+        Dispatches start/pause/resume/stop to src.commands.lifecycle instead
+        of running the command markdown through bash. Use it for state
+        transition checks; run_user_command stays the end-to-end path for
+        the markdown itself. Other commands fall back to run_user_command.
+        
+        Args:
+            command: Command name (e.g., 'start', 'pause')
+            args: Optional command arguments
+            
+        Returns:
+            Tuple of (exit_code, stdout, stderr)
+        """
+        if command not in _INPROC_COMMANDS:
+            return self.run_user_command(command, args)
             
-        return 0, '\n'.join(combined_stdout), '\n'.join(combined_stderr)
+        if self._project_root not in sys.path:
+            sys.path.insert(0, self._project_root)
+        from src.commands.lifecycle import execute_command
+        
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            exit_code = execute_command(command, args, str(self.working_dir))
+        return exit_code, stdout.getvalue(), stderr.getvalue()
+        
+    def run_and_read_state(self, command: str, args: List[str] = None) -> Tuple[int, str, str, Optional[Dict[str, Any]]]:
+        """
+        Execute a command and read the resulting project state once.
+        
+        Args:
+            command: Command name (e.g., 'start', 'pause')
+            args: Optional command arguments
+            
+        Returns:
+            Tuple of (exit_code, stdout, stderr, state); state is None when
+            the state file is missing or unreadable
+        """
+        exit_code, stdout, stderr = self.run_user_command(command, args)
+        try:
+            state = _loads(self._state_path.read_bytes())
+        except (OSError, ValueError):
+            state = None
+        return exit_code, stdout, stderr, state
+        
+    def _run_hook(self, hook_name: str, payload: bytes, *hook_args: str) -> subprocess.CompletedProcess:
+        """
+        Run a hook script with a payload on stdin.
+        
+        Args:
+            hook_name: Hook script name without .py (e.g., 'pre_tool_use')
+            payload: Encoded event data to send
+            hook_args: Extra command-line arguments for the hook
+            
+        Returns:
+            Completed process with raw bytes stdout/stderr
+        """
+        hook_path = os.path.join(self._hooks_dir, f'{hook_name}.py')
+        return subprocess.run(
+            [*_HOOK_INTERPRETER, hook_path, *hook_args],
+            input=payload,
+            capture_output=True,
+            cwd=self.working_dir,
+            env=self._hook_env
+        )
         
     def simulate_tool_use(self, tool: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -149,47 +505,67 @@ class CommandExecutor:
         Returns:
             Hook response dict
         """
-        # Create event data matching Claude Code format
-        event = {
-            "cwd": str(self.working_dir),
-            "tool": tool,
-            "input": params
-        }
+        return self.simulate_tool_use_batch([(tool, params)])[0]
         
-        # Run pre_tool_use hook
-        hook_path = self.src_path / 'hooks' / 'pre_tool_use.py'
+    def simulate_tool_use_batch(self, tool_calls: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Simulate several tool calls through one pre_tool_use hook process.
         
-        try:
-            result = subprocess.run(
-                [sys.executable, str(hook_path)],
-                input=json.dumps(event),
-                capture_output=True,
-                text=True,
-                cwd=self.working_dir
-            )
+        Events are sent as newline-delimited JSON to the hook's --batch mode
+        and handled in order, so later calls see earlier state changes.
+        
+        Args:
+            tool_calls: (tool, params) pairs, e.g. [('Write', {...})]
             
-            if result.returncode != 0:
-                return {
-                    "decision": "error",
-                    "message": f"Hook failed: {result.stderr}"
-                }
-                
-            # Parse response
-            if result.stdout:
-                return json.loads(result.stdout)
-            else:
-                return {"decision": "allow", "message": "No response from hook"}
-                
-        except json.JSONDecodeError:
-            return {
-                "decision": "error", 
-                "message": f"Invalid JSON response: {result.stdout}"
+        Returns:
+            Hook response dicts, one per tool call
+        """
+        # Create event data matching Claude Code format
+        events = [
+            {
+                "cwd": str(self.working_dir),
+                "tool": tool,
+                "input": params
             }
+            for tool, params in tool_calls
+        ]
+        
+        # Run pre_tool_use hook, through the warm process when there is one
+        try:
+            if self.hook_pool is not None:
+                lines = [self.hook_pool.send('pre_tool_use', _dumps(event)) for event in events]
+            else:
+                result = self._run_hook(
+                    'pre_tool_use', b'\n'.join(_dumps(event) for event in events), '--batch'
+                )
+                if result.returncode != 0:
+                    return [{
+                        "decision": "error",
+                        "message": f"Hook failed: {result.stderr.decode('utf-8', 'replace')}"
+                    }] * len(events)
+                lines = result.stdout.splitlines()
         except Exception as e:
-            return {
+            return [{
                 "decision": "error",
                 "message": f"Hook execution failed: {e}"
-            }
+            }] * len(events)
+            
+        # Parse one response line per event
+        responses = []
+        for i in range(len(events)):
+            line = lines[i] if i < len(lines) else b''
+            if not line.strip():
+                responses.append({"decision": "allow", "message": "No response from hook"})
+                continue
+            try:
+                responses.append(_loads(line))
+            except json.JSONDecodeError:
+                responses.append({
+                    "decision": "error", 
+                    "message": f"Invalid JSON response: {line.decode('utf-8', 'replace')}"
+                })
+                
+        return responses
             
     def simulate_post_tool_use(self, tool: str, params: Dict[str, Any], 
                               exit_code: int = 0) -> Dict[str, Any]:
@@ -211,19 +587,11 @@ class CommandExecutor:
             "exit_code": exit_code
         }
         
-        hook_path = self.src_path / 'hooks' / 'post_tool_use.py'
-        
         try:
-            result = subprocess.run(
-                [sys.executable, str(hook_path)],
-                input=json.dumps(event),
-                capture_output=True,
-                text=True,
-                cwd=self.working_dir
-            )
+            result = self._run_hook('post_tool_use', _dumps(event))
             
             if result.stdout:
-                return json.loads(result.stdout)
+                return _loads(result.stdout)
             else:
                 return {"status": "success"}
                 
@@ -245,25 +613,35 @@ class CommandExecutor:
             "response": response
         }
         
-        hook_path = self.src_path / 'hooks' / 'stop.py'
-        
         try:
-            result = subprocess.run(
-                [sys.executable, str(hook_path)],
-                input=json.dumps(event),
-                capture_output=True,
-                text=True,
-                cwd=self.working_dir
-            )
+            result = self._run_hook('stop', _dumps(event))
             
             if result.stdout:
-                return json.loads(result.stdout)
+                return _loads(result.stdout)
             else:
                 return {"status": "success"}
                 
         except Exception as e:
             return {"status": "error", "message": str(e)}
             
+    def simulate_stop_hook_and_read_state(self, response: str = "Task complete") -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """
+        Simulate Stop hook execution and read the resulting project state once.
+        
+        Args:
+            response: Claude's response text
+            
+        Returns:
+            Tuple of (hook response dict, state); state is None when the
+            state file is missing or unreadable
+        """
+        hook_response = self.simulate_stop_hook(response)
+        try:
+            state = _loads(self._state_path.read_bytes())
+        except (OSError, ValueError):
+            state = None
+        return hook_response, state
+        
     def extract_command_from_markdown(self, markdown_path: str) -> List[str]:
         """
         Extract executable commands from markdown file.
@@ -274,11 +652,7 @@ class CommandExecutor:
         Returns:
             List of bash commands to execute
         """
-        with open(markdown_path, 'r') as f:
-            content = f.read()
-            
         # Extract commands between !` and `
-        bash_pattern = r'^!`(.+?)`$'
-        commands = re.findall(bash_pattern, content, re.MULTILINE)
+        _, commands, _ = _read_commands(str(markdown_path), os.path.getmtime(markdown_path))
         
-        return commands
\ No newline at end of file
+        return list(commands)
\ No newline at end of file
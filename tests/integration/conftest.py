@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Shared pytest fixtures for the integration tests.
+
+Sets up one git-backed test environment per session and resets the
+project state file before each test instead of rebuilding the tree.
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Add integration directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from test_utilities import TestEnvironment, tmp_root
+from src.project_builder import ProjectBuilder
+from src.state_manager import StateManager
+
+
+def pytest_configure(config):
+    """Register the markers used by the integration tests."""
+    config.addinivalue_line(
+        "markers",
+        "integration: end-to-end test whose steps share state and must run in order"
+    )
+
+
+@pytest.fixture(scope="session")
+def worktree():
+    """Git-backed test environment shared by the whole session."""
+    # The setup command creates worktrees next to the test directory, so
+    # keep both under one temporary directory that is removed at the end
+    with tempfile.TemporaryDirectory(prefix="aiflow_cmd_", dir=tmp_root()) as base_dir:
+        env = TestEnvironment()
+        test_dir = env.setup("command-test", base_dir=base_dir)
+
+        # Capture a freshly created state file as the reset template
+        state_manager = StateManager(test_dir)
+        env.state_path = state_manager.state_file
+        env.state_template = json.dumps(state_manager.create("test-project"), indent=2)
+        env.state_path.unlink()
+
+        yield env
+        env.teardown()
+
+
+@pytest.fixture
+def fresh_state(worktree):
+    """Reset .project-state.json from the session template and return the test directory."""
+    worktree.state_path.write_text(worktree.state_template)
+    return worktree.state_path.parent
+
+
+@pytest.fixture
+def state_path(worktree):
+    """Path of the shared test directory's .project-state.json."""
+    return worktree.state_path
+
+
+@pytest.fixture(scope="session")
+def project_skeleton():
+    """Project structure built once by ProjectBuilder for the session."""
+    # Built on tmp_root() alongside the test directories it is copied into
+    with tempfile.TemporaryDirectory(prefix="aiflow_skeleton_", dir=tmp_root()) as skeleton:
+        ProjectBuilder("test-project", skeleton).create_structure()
+        yield Path(skeleton)
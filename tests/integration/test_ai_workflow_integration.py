@@ -7,7 +7,6 @@ Tests complete workflow with MockClaudeProvider.
 import unittest
 import json
 import tempfile
-import shutil
 from pathlib import Path
 import sys
 import os
@@ -18,77 +17,132 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from mocks.mock_claude_provider import MockClaudeProviderWithState
 
+# phase -> (prompt, context, expected response properties), in workflow order
+_WORKFLOW_PHASES = {
+    "setup": (
+        "Setup a new project called calculator",
+        {"project_name": "calculator"},
+        {"types": ("project_setup",), "keys": ("commands",), "sprint": "planning"}
+    ),
+    "implement": (
+        "Implement a function add_numbers that adds two numbers",
+        None,
+        # The mock can return either 'function' or 'code_implementation'
+        {"types": ("function", "code_implementation"), "keys": ("code",),
+         "code_contains": "def add_numbers", "sprint": "implementation"}
+    ),
+    "test": (
+        "Create tests for the add_numbers function",
+        None,
+        {}
+    ),
+    "review": (
+        "Review the add_numbers implementation for quality",
+        None,
+        {"types": ("code_review",), "keys": ("issues",)}
+    ),
+    "error": (
+        "Debug error: TypeError when adding string and number",
+        None,
+        {"types": ("error_analysis",), "keys": ("fix",)}
+    ),
+}
+_WORKFLOW_PHASE_ORDER = tuple(_WORKFLOW_PHASES)
+
+# (description, expected type) for test_complex_multi_step_workflow
+_WORKFLOW_STEPS = (
+    ("Setup project structure", "project_setup"),
+    ("Create database schema", "code_implementation"),
+    ("Implement API endpoints", "code_implementation"),
+    ("Write unit tests", "code_implementation"),
+    ("Perform code review", "code_review"),
+    ("Fix review issues", "code_implementation"),
+    ("Run integration tests", "general"),
+    ("Deploy to staging", "general")
+)
+# Implementation steps are followed by a "Step completed" query
+_WORKFLOW_COMPLETION_MASK = tuple("implement" in desc.lower() for desc, _ in _WORKFLOW_STEPS)
+_WORKFLOW_EXPECTED_HISTORY_LEN = len(_WORKFLOW_STEPS) + sum(_WORKFLOW_COMPLETION_MASK)
+
 
 class TestAIWorkflowIntegration(unittest.TestCase):
     """Test complete AI-driven development workflow"""
     
+    @classmethod
+    def setUpClass(cls):
+        """Create one provider for the whole class"""
+        cls._provider = MockClaudeProviderWithState()
+        
     def setUp(self):
         """Set up test fixtures"""
-        self.provider = MockClaudeProviderWithState()
         # Ensure clean state for each test
-        self.provider.reset()
-        self.temp_dir = tempfile.mkdtemp()
-        self.project_dir = Path(self.temp_dir) / "test_project"
-        
-    def tearDown(self):
-        """Clean up test fixtures"""
-        shutil.rmtree(self.temp_dir)
-        
-    def test_complete_development_workflow(self):
-        """Test complete workflow from setup to implementation"""
-        # Sprint 1: Project Setup
-        setup_response = self.provider.query(
-            "Setup a new project called calculator",
-            context={"project_name": "calculator"}
-        )
-        
-        self.assertEqual(setup_response["type"], "project_setup")
-        self.assertIn("commands", setup_response)
-        
-        # Verify state tracking
-        state = self.provider.get_state()
-        self.assertEqual(state["project_sprint"], "planning")
-        
-        # Sprint 2: Implementation
-        impl_response = self.provider.query(
-            "Implement a function add_numbers that adds two numbers"
-        )
+        self._provider.reset()
+        self.provider = self._provider
+        self.temp_dir = None
+            
+    def _ensure_tempdir(self) -> Path:
+        """Create the project directory on first use and return it"""
+        if self.temp_dir is None:
+            # Removed by addCleanup even if the test fails midway
+            temp_dir = tempfile.TemporaryDirectory(prefix="aiflow_wf_")
+            self.addCleanup(temp_dir.cleanup)
+            self.temp_dir = temp_dir.name
+            self.project_dir = Path(temp_dir.name) / "test_project"
+        return self.project_dir
+        
+    def _query_phase(self, phase: str) -> dict:
+        """Run one workflow phase against the current provider state and check it"""
+        prompt, context, expected = _WORKFLOW_PHASES[phase]
+        response = self.provider.query(prompt, context=context)
+        
+        if "types" in expected:
+            self.assertIn(response["type"], expected["types"])
+        for key in expected.get("keys", ()):
+            self.assertIn(key, response)
+        if "code_contains" in expected:
+            self.assertIn(expected["code_contains"], response["code"])
+            
+        # Verify sprint tracking
+        if "sprint" in expected:
+            self.assertEqual(self.provider.peek_state()["project_sprint"], expected["sprint"])
+        return response
         
-        # The mock can return either 'function' or 'code_implementation'
-        self.assertIn(impl_response["type"], ["function", "code_implementation"])
-        self.assertIn("code", impl_response)
-        self.assertIn("def add_numbers", impl_response["code"])
+    def _check_phase(self, phase: str):
+        """Replay the phases before this one, then run and check it"""
+        earlier = _WORKFLOW_PHASE_ORDER[:_WORKFLOW_PHASE_ORDER.index(phase)]
+        self.provider.query_many([_WORKFLOW_PHASES[name][:2] for name in earlier])
+        self._query_phase(phase)
         
-        # Verify sprint transition
-        state = self.provider.get_state()
-        self.assertEqual(state["project_sprint"], "implementation")
+    def test_workflow_phase_setup(self):
+        """Test the project setup phase"""
+        self._check_phase("setup")
         
-        # Sprint 3: Testing
-        test_response = self.provider.query(
-            "Create tests for the add_numbers function"
-        )
+    def test_workflow_phase_implement(self):
+        """Test the implementation phase"""
+        self._check_phase("implement")
         
-        # Sprint 4: Code Review
-        review_response = self.provider.query(
-            "Review the add_numbers implementation for quality"
-        )
+    def test_workflow_phase_test(self):
+        """Test the testing phase"""
+        self._check_phase("test")
         
-        self.assertEqual(review_response["type"], "code_review")
-        self.assertIn("issues", review_response)
+    def test_workflow_phase_review(self):
+        """Test the code review phase"""
+        self._check_phase("review")
         
-        # Sprint 5: Error Handling
-        error_response = self.provider.query(
-            "Debug error: TypeError when adding string and number"
-        )
+    def test_workflow_phase_error(self):
+        """Test the error handling phase"""
+        self._check_phase("error")
         
-        self.assertEqual(error_response["type"], "error_analysis")
-        self.assertIn("fix", error_response)
+    def test_complete_development_workflow(self):
+        """Test complete workflow from setup to implementation"""
+        for phase in _WORKFLOW_PHASE_ORDER:
+            self._query_phase(phase)
         
         # Verify complete workflow tracking
         history = self.provider.get_call_history()
-        self.assertEqual(len(history), 5)
+        self.assertEqual(len(history), len(_WORKFLOW_PHASE_ORDER))
         
-        final_state = self.provider.get_state()
+        final_state = self.provider.peek_state()
         self.assertEqual(final_state["error_count"], 1)
         
     def test_iterative_development_with_feedback(self):
@@ -105,7 +159,7 @@ class TestAIWorkflowIntegration(unittest.TestCase):
         )
         
         # Verify context accumulation
-        state = self.provider.get_state()
+        state = self.provider.peek_state()
         self.assertIn("previous_code", state["current_context"])
         
         # Another iteration
@@ -135,7 +189,7 @@ class TestAIWorkflowIntegration(unittest.TestCase):
         self.provider.query("Deploy the API to production")
         
         # Verify accumulated state
-        final_state = self.provider.get_state()
+        final_state = self.provider.peek_state()
         self.assertEqual(final_state["project_sprint"], "deployment")
         self.assertIn("auth_endpoint", final_state["completed_tasks"])
         self.assertIn("auth_tests", final_state["completed_tasks"])
@@ -149,13 +203,15 @@ class TestAIWorkflowIntegration(unittest.TestCase):
             "SyntaxError: invalid syntax on line 42"
         ]
         
-        for error in errors:
-            response = self.provider.query(f"Help fix this error: {error}")
+        responses = self.provider.query_many(
+            [(f"Help fix this error: {error}", None) for error in errors]
+        )
+        for response in responses:
             self.assertEqual(response["type"], "error_analysis")
             self.assertIn("fix", response)
             
         # Verify error tracking
-        state = self.provider.get_state()
+        state = self.provider.peek_state()
         self.assertEqual(state["error_count"], 3)
         
     def test_ai_guided_refactoring(self):
@@ -172,7 +228,7 @@ class TestAIWorkflowIntegration(unittest.TestCase):
         )
         
         # Verify context is maintained
-        state = self.provider.get_state()
+        state = self.provider.peek_state()
         self.assertIn("code", state["current_context"])
         
     def test_workflow_with_failures(self):
@@ -197,37 +253,25 @@ class TestAIWorkflowIntegration(unittest.TestCase):
         
     def test_complex_multi_step_workflow(self):
         """Test complex workflow with multiple interdependent steps"""
-        workflow_steps = [
-            ("Setup project structure", "project_setup"),
-            ("Create database schema", "code_implementation"),
-            ("Implement API endpoints", "code_implementation"),
-            ("Write unit tests", "code_implementation"),
-            ("Perform code review", "code_review"),
-            ("Fix review issues", "code_implementation"),
-            ("Run integration tests", "general"),
-            ("Deploy to staging", "general")
-        ]
+        prompts = []
+        for (step_description, expected_type), needs_completion in zip(_WORKFLOW_STEPS, _WORKFLOW_COMPLETION_MASK):
+            prompts.append((step_description, None))
+            
+            # Mark step as completed
+            if needs_completion:
+                prompts.append(("Step completed", {"task": step_description}))
         
-        for step_description, expected_type in workflow_steps:
-            response = self.provider.query(step_description)
+        for response in self.provider.query_many(prompts):
             # Some steps might return different types based on keywords
             self.assertIn("type", response)
-            
-            # Mark step as completed
-            if "implement" in step_description.lower():
-                self.provider.query(
-                    "Step completed",
-                    context={"task": step_description}
-                )
         
         # Verify workflow completion
-        final_state = self.provider.get_state()
+        final_state = self.provider.peek_state()
         self.assertTrue(len(final_state["completed_tasks"]) > 0)
         
         # Verify full history
         history = self.provider.get_call_history()
-        self.assertEqual(len(history), len(workflow_steps) + 
-                        len([s for s in workflow_steps if "implement" in s[0].lower()]))
+        self.assertEqual(len(history), _WORKFLOW_EXPECTED_HISTORY_LEN)
 
 
 if __name__ == '__main__':
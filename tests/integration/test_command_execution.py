@@ -6,326 +6,244 @@ Tests that command markdown files execute properly without needing
 actual Claude interaction.
 """
 
-import os
+import logging
 import sys
 from pathlib import Path
 
+import pytest
+
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent))
 
 from command_executor import CommandExecutor
 from test_utilities import (
-    TestEnvironment, 
-    verify_workflow_state,
+    assert_state_matches,
+    copy_skeleton,
     verify_project_structure,
     read_project_state,
     update_project_state
 )
 
+logger = logging.getLogger(__name__)
+
+
+@pytest.fixture(scope="module")
+def executor(worktree):
+    """Command executor bound to the shared test directory."""
+    return CommandExecutor(Path(worktree.test_dir))
 
-class CommandExecutionTest:
-    """Test command execution without Claude."""
+
+def test_setup_command(executor, fresh_state):
+    """Test project setup command."""
+    logger.info("Testing setup command")
     
-    def __init__(self):
-        self.env = TestEnvironment()
-        self.passed = 0
-        self.failed = 0
-        
-    def setup(self):
-        """Setup test environment."""
-        self.test_dir = self.env.setup("command-test")
-        self.executor = CommandExecutor(self.test_dir)
-        print(f"✅ Test environment created at: {self.test_dir}")
-        
-    def teardown(self):
-        """Cleanup test environment."""
-        self.env.teardown()
-        print("✅ Test environment cleaned up")
-        
-    def test_setup_command(self):
-        """Test project setup command."""
-        print("\n🧪 Testing setup command...")
-        
-        # The setup command creates a worktree in the parent directory
-        # For testing, we'll use the command executor which handles path adjustments
-        exit_code, stdout, stderr = self.executor.run_user_command("setup", ["test-subproject"])
-        
-        if exit_code == 0:
-            # Check if worktree was created (in parent directory)
-            worktree_path = self.test_dir.parent / "test-subproject"
-            assert worktree_path.exists(), f"Worktree not created at {worktree_path}"
-            
-            # Verify project structure in the worktree
-            structure = verify_project_structure(worktree_path)
-            assert structure['sprints'], "sprints directory not created"
-            assert structure['.claude'], ".claude directory not created"
-            assert structure['logs'], "logs directory not created"
-            assert structure['docs'], "docs directory not created"
-            assert structure['sprint_files'], "sprint files not created"
-            
-            # Verify state file in the worktree
-            state = read_project_state(worktree_path)
-            assert state is not None, "State file not created"
-            assert state['project_name'] == 'test-subproject', "Wrong project name"
-            assert state['status'] == 'setup', "Wrong initial status"
-            
-            print("  ✓ Project structure created correctly")
-            print("  ✓ State file initialized properly")
-        else:
-            print("  ⚠️  Setup script not found, skipping detailed test")
-            
-        print("✅ Setup command test passed")
-        self.passed += 1
-        
-    def test_start_command(self):
-        """Test project start command."""
-        print("\n🧪 Testing start command...")
-        
-        # Create project first
-        from src.project_builder import ProjectBuilder
-        from src.state_manager import StateManager
-        
-        builder = ProjectBuilder("test-project", str(self.test_dir))
-        builder.create_structure()
-        
-        state_manager = StateManager(self.test_dir)
-        state_manager.create("test-project")
-        
-        # Now test start command
-        exit_code, stdout, stderr = self.executor.run_user_command("start")
-        
-        if exit_code == 0:
-            # Verify state changes
-            state = read_project_state(self.test_dir)
-            assert state['status'] == 'active', \
-                f"Expected status 'active' but got '{state['status']}'"
-            assert state['automation_active'] == True, \
-                "Expected automation_active to be True"
-            assert state['workflow_step'] == 'planning', \
-                f"Expected workflow_step 'planning' but got '{state['workflow_step']}'"
-            
-            print("  ✓ Project started successfully")
-            print("  ✓ Automation activated")
-            print("  ✓ Workflow set to planning sprint")
-            print("✅ Start command test passed")
-            self.passed += 1
-        else:
-            print(f"  ❌ Start command failed: {stderr}")
-            self.failed += 1
-            
-    def test_pause_command(self):
-        """Test project pause command."""
-        print("\n🧪 Testing pause command...")
-        
-        # Start project first
-        update_project_state(self.test_dir, {
-            'status': 'active',
-            'automation_active': True
-        })
-        
-        # Test pause
-        exit_code, stdout, stderr = self.executor.run_user_command("pause")
-        
-        # Debug output
-        print(f"  Debug - Exit code: {exit_code}")
-        print(f"  Debug - Stdout: {stdout}")
-        print(f"  Debug - Stderr: {stderr}")
-        
-        if exit_code == 0:
-            state = read_project_state(self.test_dir)
-            assert state['status'] == 'paused', \
-                f"Expected status 'paused' but got '{state['status']}'"
-            assert state['automation_active'] == False, \
-                "Expected automation_active to be False"
-            
-            print("  ✓ Project paused successfully")
-            print("  ✓ Automation deactivated")
-            print("✅ Pause command test passed")
-            self.passed += 1
-        else:
-            print(f"  ❌ Pause command failed: {stderr}")
-            self.failed += 1
-            
-    def test_resume_command(self):
-        """Test project resume command."""
-        print("\n🧪 Testing resume command...")
-        
-        # Pause project first
-        update_project_state(self.test_dir, {
-            'status': 'paused',
-            'automation_active': False
-        })
-        
-        # Test resume
-        exit_code, stdout, stderr = self.executor.run_user_command("resume")
-        
-        # Debug output
-        print(f"  Debug - Exit code: {exit_code}")
-        print(f"  Debug - Stdout: {stdout}")
-        print(f"  Debug - Stderr: {stderr}")
-        
-        if exit_code == 0:
-            state = read_project_state(self.test_dir)
-            assert state['status'] == 'active', \
-                f"Expected status 'active' but got '{state['status']}'"
-            assert state['automation_active'] == True, \
-                "Expected automation_active to be True"
-            
-            print("  ✓ Project resumed successfully")
-            print("  ✓ Automation reactivated")
-            print("✅ Resume command test passed")
-            self.passed += 1
-        else:
-            print(f"  ❌ Resume command failed: {stderr}")
-            self.failed += 1
-            
-    def test_status_command(self):
-        """Test project status command."""
-        print("\n🧪 Testing status command...")
-        
-        # Setup known state
-        update_project_state(self.test_dir, {
-            'project_name': 'test-project',
-            'status': 'active',
-            'current_sprint': '01',
-            'workflow_step': 'implementation',
-            'automation_active': True,
-            'completed_sprints': [],
-            'files_modified': ['src/main.py', 'tests/test_main.py']
-        })
-        
-        # Test status command
-        exit_code, stdout, stderr = self.executor.run_user_command("status")
-        
-        if exit_code == 0:
-            # Verify output contains key information
-            assert 'test-project' in stdout, "Project name not in output"
-            assert 'active' in stdout.lower(), "Status not in output"
-            assert 'implementation' in stdout.lower(), "Workflow step not in output"
-            
-            print("  ✓ Status displayed successfully")
-            print("  ✓ Key information included")
-            print("✅ Status command test passed")
-            self.passed += 1
-        else:
-            print(f"  ❌ Status command failed: {stderr}")
-            self.failed += 1
-            
-    def test_stop_command(self):
-        """Test project stop command."""
-        print("\n🧪 Testing stop command...")
-        
-        # Setup active project
-        update_project_state(self.test_dir, {
-            'status': 'active',
-            'automation_active': True
-        })
-        
-        # Test stop
-        exit_code, stdout, stderr = self.executor.run_user_command("stop")
-        
-        if exit_code == 0:
-            state = read_project_state(self.test_dir)
-            assert state['status'] == 'stopped', \
-                f"Expected status 'stopped' but got '{state['status']}'"
-            assert state['automation_active'] == False, \
-                "Expected automation_active to be False"
-            
-            print("  ✓ Project stopped successfully")
-            print("  ✓ Automation deactivated")
-            print("✅ Stop command test passed")
-            self.passed += 1
-        else:
-            print(f"  ❌ Stop command failed: {stderr}")
-            self.failed += 1
-            
-    def test_invalid_command(self):
-        """Test handling of invalid command."""
-        print("\n🧪 Testing invalid command handling...")
-        
-        exit_code, stdout, stderr = self.executor.run_user_command("invalid")
-        
-        assert exit_code != 0, "Expected non-zero exit code for invalid command"
-        assert "not found" in stderr.lower(), "Expected 'not found' error message"
-        
-        print("  ✓ Invalid command rejected properly")
-        print("✅ Invalid command test passed")
-        self.passed += 1
-        
-    def test_command_state_validation(self):
-        """Test commands validate state before executing."""
-        print("\n🧪 Testing command state validation...")
-        
-        # Remove state file
-        state_file = self.test_dir / '.project-state.json'
-        if state_file.exists():
-            state_file.unlink()
-            
-        # Try to run start without state file
-        exit_code, stdout, stderr = self.executor.run_user_command("start")
-        
-        # Should fail because no project exists
-        assert exit_code != 0, "Expected start to fail without project"
-        
-        print("  ✓ Commands validate state before executing")
-        print("✅ State validation test passed")
-        self.passed += 1
-        
-    def run_all_tests(self):
-        """Run all command execution tests."""
-        print("\n" + "="*60)
-        print("🚀 Running Command Execution Tests")
-        print("="*60)
-        
-        tests = [
-            self.test_setup_command,
-            self.test_start_command,
-            self.test_pause_command,
-            self.test_resume_command,
-            self.test_status_command,
-            self.test_stop_command,
-            self.test_invalid_command,
-            self.test_command_state_validation
-        ]
-        
-        for test in tests:
-            try:
-                test()
-            except Exception as e:
-                print(f"❌ Test failed: {test.__name__}")
-                print(f"   Error: {e}")
-                import traceback
-                traceback.print_exc()
-                self.failed += 1
-                
-        print("\n" + "="*60)
-        print(f"📊 Test Results: {self.passed} passed, {self.failed} failed")
-        print("="*60)
-        
-        return self.failed == 0
+    # The setup command creates a worktree in the parent directory
+    # For testing, we'll use the command executor which handles path adjustments
+    exit_code, stdout, stderr = executor.run_user_command("setup", ["test-subproject"])
+    
+    if exit_code == 0:
+        # Check if worktree was created (in parent directory)
+        worktree_path = fresh_state.parent / "test-subproject"
+        assert worktree_path.exists(), f"Worktree not created at {worktree_path}"
+        
+        # Verify project structure in the worktree
+        structure = verify_project_structure(worktree_path)
+        assert structure['sprints'], "sprints directory not created"
+        assert structure['.claude'], ".claude directory not created"
+        assert structure['logs'], "logs directory not created"
+        assert structure['docs'], "docs directory not created"
+        assert structure['sprint_files'], "sprint files not created"
+        
+        # Verify state file in the worktree
+        state = read_project_state(worktree_path)
+        assert_state_matches(state, project_name='test-subproject', status='setup')
+        
+        logger.debug("Project structure created correctly")
+        logger.debug("State file initialized properly")
+    else:
+        logger.warning("Setup script not found, skipping detailed test")
+        
+    logger.info("Setup command test passed")
 
 
-def main():
-    """Main test runner."""
-    test = CommandExecutionTest()
-    
-    try:
-        test.setup()
-        success = test.run_all_tests()
-        test.teardown()
+def test_start_command(executor, fresh_state, project_skeleton):
+    """Test project start command."""
+    logger.info("Testing start command")
+    
+    # Create project first; fresh_state already holds the initial state
+    copy_skeleton(project_skeleton, fresh_state)
+    
+    # Now test start command
+    exit_code, stdout, stderr, state = executor.run_and_read_state("start")
+    
+    assert exit_code == 0, f"Start command failed: {stderr}"
+    
+    # Verify state changes
+    assert_state_matches(state, status='active', automation_active=True, workflow_step='planning')
+    
+    logger.debug("Project started successfully")
+    logger.debug("Automation activated")
+    logger.debug("Workflow set to planning sprint")
+    logger.info("Start command test passed")
+
+
+def test_pause_command(executor, fresh_state):
+    """Test project pause command."""
+    logger.info("Testing pause command")
+    
+    # Start project first
+    update_project_state(fresh_state, {
+        'status': 'active',
+        'automation_active': True
+    })
+    
+    # Test pause
+    exit_code, stdout, stderr, state = executor.run_and_read_state("pause")
+    
+    # Debug output, only formatted when DEBUG logging is on
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Exit code: %s", exit_code)
+        logger.debug("Stdout: %s", stdout)
+        logger.debug("Stderr: %s", stderr)
+    
+    assert exit_code == 0, f"Pause command failed: {stderr}"
+    
+    assert_state_matches(state, status='paused', automation_active=False)
+    
+    logger.debug("Project paused successfully")
+    logger.debug("Automation deactivated")
+    logger.info("Pause command test passed")
+
+
+def test_resume_command(executor, fresh_state):
+    """Test project resume command."""
+    logger.info("Testing resume command")
+    
+    # Pause project first
+    update_project_state(fresh_state, {
+        'status': 'paused',
+        'automation_active': False
+    })
+    
+    # Test resume
+    exit_code, stdout, stderr, state = executor.run_and_read_state("resume")
+    
+    # Debug output, only formatted when DEBUG logging is on
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Exit code: %s", exit_code)
+        logger.debug("Stdout: %s", stdout)
+        logger.debug("Stderr: %s", stderr)
+    
+    assert exit_code == 0, f"Resume command failed: {stderr}"
+    
+    assert_state_matches(state, status='active', automation_active=True)
+    
+    logger.debug("Project resumed successfully")
+    logger.debug("Automation reactivated")
+    logger.info("Resume command test passed")
+
+
+def test_status_command(executor, fresh_state):
+    """Test project status command."""
+    logger.info("Testing status command")
+    
+    # Setup known state
+    update_project_state(fresh_state, {
+        'project_name': 'test-project',
+        'status': 'active',
+        'current_sprint': '01',
+        'workflow_step': 'implementation',
+        'automation_active': True,
+        'completed_sprints': [],
+        'files_modified': ['src/main.py', 'tests/test_main.py']
+    })
+    
+    # Test status command
+    exit_code, stdout, stderr = executor.run_user_command("status")
+    
+    assert exit_code == 0, f"Status command failed: {stderr}"
+    
+    # Verify output contains key information
+    assert 'test-project' in stdout, "Project name not in output"
+    assert 'active' in stdout.lower(), "Status not in output"
+    assert 'implementation' in stdout.lower(), "Workflow step not in output"
+    
+    logger.debug("Status displayed successfully")
+    logger.debug("Key information included")
+    logger.info("Status command test passed")
+
+
+def test_stop_command(executor, fresh_state):
+    """Test project stop command."""
+    logger.info("Testing stop command")
+    
+    # Setup active project
+    update_project_state(fresh_state, {
+        'status': 'active',
+        'automation_active': True
+    })
+    
+    # Test stop
+    exit_code, stdout, stderr, state = executor.run_and_read_state("stop")
+    
+    assert exit_code == 0, f"Stop command failed: {stderr}"
+    
+    assert_state_matches(state, status='stopped', automation_active=False)
+    
+    logger.debug("Project stopped successfully")
+    logger.debug("Automation deactivated")
+    logger.info("Stop command test passed")
+
+
+def test_inproc_lifecycle_transitions(executor, fresh_state, state_path, project_skeleton):
+    """Test lifecycle state transitions through the in-process path."""
+    logger.info("Testing in-process lifecycle commands")
+    
+    copy_skeleton(project_skeleton, fresh_state)
+    
+    for command, status, automation_active in (
+        ("start", "active", True),
+        ("pause", "paused", False),
+        ("resume", "active", True),
+    ):
+        exit_code, stdout, stderr = executor.run_user_command_inproc(command)
+        assert exit_code == 0, f"In-process {command} failed: {stdout}{stderr}"
+        
+        state = read_project_state(fresh_state, state_path)
+        assert_state_matches(state, status=status, automation_active=automation_active)
+    
+    logger.info("In-process lifecycle test passed")
+
+
+def test_invalid_command(executor, fresh_state):
+    """Test handling of invalid command."""
+    logger.info("Testing invalid command handling")
+    
+    exit_code, stdout, stderr = executor.run_user_command("invalid")
+    
+    assert exit_code != 0, "Expected non-zero exit code for invalid command"
+    assert "not found" in stderr.lower(), "Expected 'not found' error message"
+    
+    logger.debug("Invalid command rejected properly")
+    logger.info("Invalid command test passed")
+
+
+def test_command_state_validation(executor, fresh_state, state_path):
+    """Test commands validate state before executing."""
+    logger.info("Testing command state validation")
+    
+    # Remove state file
+    state_path.unlink(missing_ok=True)
         
-        if success:
-            print("\n✅ All command execution tests passed!")
-            sys.exit(0)
-        else:
-            print("\n❌ Some tests failed!")
-            sys.exit(1)
-            
-    except Exception as e:
-        print(f"\n💥 Fatal error: {e}")
-        test.teardown()
-        sys.exit(2)
+    # Try to run start without state file
+    exit_code, stdout, stderr = executor.run_user_command("start")
+    
+    # Should fail because no project exists
+    assert exit_code != 0, "Expected start to fail without project"
+    
+    logger.debug("Commands validate state before executing")
+    logger.info("State validation test passed")
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    sys.exit(pytest.main([__file__, '-v']))
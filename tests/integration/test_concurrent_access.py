@@ -17,21 +17,58 @@ from datetime import datetime, timezone
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from src.state_manager import StateManager, StateValidationError
+from src.state_manager import FileLock, StateManager, StateValidationError
 
+# Add integration directory to path
+sys.path.insert(0, str(Path(__file__).parent))
 
-def update_state_process(test_dir: str, process_id: int, updates_per_process: int):
-    """Worker process that performs multiple state updates."""
+from test_utilities import tmp_root
+
+# Worker count for the shared pool: the largest batch any test submits
+POOL_SIZE = 10
+
+# Longest wait for pool workers to start (seconds)
+POOL_START_TIMEOUT = 60
+
+
+def signal_worker_ready(ready):
+    """Pool initializer: report that this worker has started and imported its modules."""
+    ready.release()
+
+
+def update_state_process(test_dir: str, process_id: int, updates_per_process: int,
+                         force_contention: bool = False):
+    """
+    Worker process that performs multiple state updates.
+    
+    By default all updates go through one update_batch call. With
+    force_contention each update takes the lock separately, with a short
+    pause in between, so writers interleave with other processes.
+    """
     state_manager = StateManager(test_dir)
     
-    for i in range(updates_per_process):
+    # Process-specific data for each update; the key makes each update
+    # unique, so one timestamp serves them all
+    timestamp = datetime.now(timezone.utc).isoformat()
+    all_updates = [
+        {
+            f'process_{process_id}_update_{i}': timestamp,
+            'last_process': process_id,
+            'automation_cycles': i
+        }
+        for i in range(updates_per_process)
+    ]
+    
+    if not force_contention:
+        try:
+            state_manager.update_batch(all_updates)
+        except Exception as e:
+            print(f"Process {process_id} error on batch update: {e}")
+            raise
+        return
+        
+    for i, update_data in enumerate(all_updates):
         try:
-            # Perform update with process-specific data
-            update_data = {
-                f'process_{process_id}_update_{i}': datetime.now(timezone.utc).isoformat(),
-                'last_process': process_id,
-                'automation_cycles': i
-            }
             state_manager.update(update_data)
             
             # Small delay to increase chance of contention
@@ -66,20 +103,56 @@ class ConcurrentAccessTest:
     
     def __init__(self):
         self.test_dir = None
+        self.pool = None
         self.passed = 0
         self.failed = 0
         
     def setup(self):
         """Create test environment."""
-        self.test_dir = tempfile.mkdtemp(prefix="claude_concurrent_")
+        self.test_dir = tempfile.mkdtemp(prefix="claude_concurrent_", dir=tmp_root())
         print(f"✅ Created test directory: {self.test_dir}")
         
+        # Start the worker interpreters once and reuse them in every test
+        context = multiprocessing.get_context("spawn")
+        ready = context.Semaphore(0)
+        self.pool = context.Pool(processes=POOL_SIZE, initializer=signal_worker_ready,
+                                 initargs=(ready,))
+        
+        # Wait until every worker is up, so interpreter startup and imports
+        # stay out of the measured durations
+        for _ in range(POOL_SIZE):
+            if not ready.acquire(timeout=POOL_START_TIMEOUT):
+                raise RuntimeError("Timed out waiting for pool workers to start")
+        
     def teardown(self):
         """Clean up test environment."""
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+            
         if self.test_dir and Path(self.test_dir).exists():
             shutil.rmtree(self.test_dir)
             print("✅ Cleaned up test directory")
             
+    def run_in_pool(self, func, args_list) -> bool:
+        """
+        Run func once per argument tuple on the shared pool.
+        
+        Args:
+            func: Worker function
+            args_list: One argument tuple per work item
+            
+        Returns:
+            True if every work item completed without raising
+        """
+        try:
+            self.pool.starmap_async(func, args_list).get()
+            return True
+        except Exception as e:
+            print(f"  Worker error: {e}")
+            return False
+            
     def test_concurrent_updates(self):
         """Test multiple processes updating state simultaneously."""
         print("\n🧪 Testing concurrent state updates...")
@@ -92,28 +165,14 @@ class ConcurrentAccessTest:
         num_processes = 5
         updates_per_process = 10
         
-        # Create processes
-        processes = []
-        for i in range(num_processes):
-            p = multiprocessing.Process(
-                target=update_state_process,
-                args=(self.test_dir, i, updates_per_process)
-            )
-            processes.append(p)
-            
-        # Start all processes
-        start_time = time.time()
-        for p in processes:
-            p.start()
-            
-        # Wait for completion
-        for p in processes:
-            p.join()
-            
-        duration = time.time() - start_time
+        # Run updates on the shared pool
+        start_time = time.monotonic()
+        success = self.run_in_pool(update_state_process, [
+            (self.test_dir, i, updates_per_process) for i in range(num_processes)
+        ])
+        duration = time.monotonic() - start_time
         
         # Verify all processes completed successfully
-        success = all(p.exitcode == 0 for p in processes)
         if not success:
             print("❌ Some processes failed")
             self.failed += 1
@@ -129,7 +188,7 @@ class ConcurrentAccessTest:
                 assert key in final_state, f"Missing update: {key}"
                 
         print(f"  ✓ All {num_processes * updates_per_process} updates successful")
-        print(f"  ✓ Completed in {duration:.2f}s")
+        print(f"  ✓ Completed in {duration * 1000:.1f}ms")
         print("✅ Concurrent updates handled correctly")
         self.passed += 1
         
@@ -156,31 +215,17 @@ class ConcurrentAccessTest:
         num_processes = 10
         reads_per_process = 20
         
-        # Create processes
-        processes = []
-        for i in range(num_processes):
-            p = multiprocessing.Process(
-                target=read_state_process,
-                args=(self.test_dir, i, reads_per_process)
-            )
-            processes.append(p)
-            
-        # Start all processes
-        start_time = time.time()
-        for p in processes:
-            p.start()
-            
-        # Wait for completion
-        for p in processes:
-            p.join()
-            
-        duration = time.time() - start_time
+        # Run reads on the shared pool
+        start_time = time.monotonic()
+        success = self.run_in_pool(read_state_process, [
+            (self.test_dir, i, reads_per_process) for i in range(num_processes)
+        ])
+        duration = time.monotonic() - start_time
         
         # Verify all processes completed successfully
-        success = all(p.exitcode == 0 for p in processes)
         if success:
             print(f"  ✓ All {num_processes * reads_per_process} reads successful")
-            print(f"  ✓ Completed in {duration:.2f}s")
+            print(f"  ✓ Completed in {duration * 1000:.1f}ms")
             print("✅ Concurrent reads handled correctly")
             self.passed += 1
         else:
@@ -200,40 +245,30 @@ class ConcurrentAccessTest:
         state_manager = StateManager(self.test_dir)
         state_manager.create('concurrent-test')
         
-        # Create mix of read and write processes
-        processes = []
+        # Submit writers and readers together so they overlap on the pool;
+        # writers update one at a time to interleave with the readers
+        start_time = time.monotonic()
+        writers = self.pool.starmap_async(update_state_process, [
+            (self.test_dir, i, 5, True) for i in range(3)
+        ])
+        readers = self.pool.starmap_async(read_state_process, [
+            (self.test_dir, i + 100, 10) for i in range(5)
+        ])
         
-        # Writers
-        for i in range(3):
-            p = multiprocessing.Process(
-                target=update_state_process,
-                args=(self.test_dir, i, 5)
-            )
-            processes.append(p)
-            
-        # Readers
-        for i in range(5):
-            p = multiprocessing.Process(
-                target=read_state_process,
-                args=(self.test_dir, i + 100, 10)
-            )
-            processes.append(p)
-            
-        # Start all processes
-        start_time = time.time()
-        for p in processes:
-            p.start()
-            
         # Wait for completion
-        for p in processes:
-            p.join()
-            
-        duration = time.time() - start_time
+        success = True
+        for result in (writers, readers):
+            try:
+                result.get()
+            except Exception as e:
+                print(f"  Worker error: {e}")
+                success = False
+                
+        duration = time.monotonic() - start_time
         
         # Verify all processes completed successfully
-        success = all(p.exitcode == 0 for p in processes)
         if success:
-            print(f"  ✓ Mixed operations completed in {duration:.2f}s")
+            print(f"  ✓ Mixed operations completed in {duration * 1000:.1f}ms")
             print("✅ Mixed concurrent operations handled correctly")
             self.passed += 1
         else:
@@ -257,7 +292,6 @@ class ConcurrentAccessTest:
         state_manager.create('timeout-test')
         
         # Verify FileLock has timeout configured
-        from src.state_manager import FileLock
         lock = FileLock(state_manager.state_file, timeout=0.1)
         
         assert lock.timeout == 0.1, "Lock timeout should be configurable"
@@ -295,9 +329,6 @@ class ConcurrentAccessTest:
 
 def main():
     """Main test runner."""
-    # Required for multiprocessing on some platforms
-    multiprocessing.set_start_method('spawn', force=True)
-    
     test = ConcurrentAccessTest()
     
     try:
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Hook Server Pool Tests - Test warm hook processes fail and restart cleanly.
+
+Uses a stand-in echo hook, so no real hook scripts are involved.
+"""
+
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from command_executor import HookServerPool
+
+
+@pytest.fixture
+def echo_hook_pool(tmp_path):
+    """Hook pool whose echo hook answers, hangs, or dies depending on the event."""
+    hooks_path = tmp_path / "src" / "hooks"
+    hooks_path.mkdir(parents=True)
+    (hooks_path / "echo.py").write_text(textwrap.dedent("""
+        import sys, time
+        for line in sys.stdin:
+            sys.stderr.write("echo got " + line)
+            sys.stderr.flush()
+            if line.startswith("hang"):
+                time.sleep(60)
+            if line.startswith("die"):
+                sys.exit(3)
+            sys.stdout.write(line)
+            sys.stdout.flush()
+    """))
+    pool = HookServerPool(hooks_path, timeout=0.5)
+    yield pool
+    pool.close()
+
+
+@pytest.mark.parametrize("event, reason", [
+    (b"hang", "did not respond within 0.5s"),
+    (b"die", "exited with code 3"),
+])
+def test_hook_pool_restarts_failed_process(echo_hook_pool, event, reason):
+    """Test that a hung or dead warm hook fails with its stderr and is replaced."""
+    assert echo_hook_pool.send("echo", b"first") == b"first\n"
+    
+    with pytest.raises(RuntimeError) as excinfo:
+        echo_hook_pool.send("echo", event)
+    assert reason in str(excinfo.value)
+    assert f"echo got {event.decode()}" in str(excinfo.value)
+    
+    assert echo_hook_pool.send("echo", b"again") == b"again\n"
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-v']))
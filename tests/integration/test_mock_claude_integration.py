@@ -128,7 +128,7 @@ class TestMockClaudeProviderWithState(unittest.TestCase):
         
     def test_initial_state(self):
         """Test initial state values"""
-        state = self.provider.get_state()
+        state = self.provider.peek_state()
         
         self.assertEqual(state["project_sprint"], "planning")
         self.assertEqual(state["completed_tasks"], [])
@@ -138,11 +138,11 @@ class TestMockClaudeProviderWithState(unittest.TestCase):
     def test_sprint_transition_tracking(self):
         """Test that sprint transitions are tracked"""
         self.provider.query("Let's implement the user authentication")
-        state = self.provider.get_state()
+        state = self.provider.peek_state()
         self.assertEqual(state["project_sprint"], "implementation")
         
         self.provider.query("Run the test suite")
-        state = self.provider.get_state()
+        state = self.provider.peek_state()
         self.assertEqual(state["project_sprint"], "testing")
         
     def test_error_count_tracking(self):
@@ -150,7 +150,7 @@ class TestMockClaudeProviderWithState(unittest.TestCase):
         self.provider.query("Fix the error in line 10")
         self.provider.query("Debug the connection error")
         
-        state = self.provider.get_state()
+        state = self.provider.peek_state()
         self.assertEqual(state["error_count"], 2)
         
     def test_completed_tasks_tracking(self):
@@ -158,7 +158,7 @@ class TestMockClaudeProviderWithState(unittest.TestCase):
         self.provider.query("Task completed", context={"task": "setup"})
         self.provider.query("Implementation done", context={"task": "auth"})
         
-        state = self.provider.get_state()
+        state = self.provider.peek_state()
         self.assertIn("setup", state["completed_tasks"])
         self.assertIn("auth", state["completed_tasks"])
         
@@ -167,7 +167,7 @@ class TestMockClaudeProviderWithState(unittest.TestCase):
         self.provider.query("Query 1", context={"key1": "value1"})
         self.provider.query("Query 2", context={"key2": "value2"})
         
-        state = self.provider.get_state()
+        state = self.provider.peek_state()
         self.assertEqual(state["current_context"]["key1"], "value1")
         self.assertEqual(state["current_context"]["key2"], "value2")
         
@@ -177,7 +177,7 @@ class TestMockClaudeProviderWithState(unittest.TestCase):
         self.provider.query("Error occurred")
         
         self.provider.reset_state()
-        state = self.provider.get_state()
+        state = self.provider.peek_state()
         
         self.assertEqual(state["project_sprint"], "planning")
         self.assertEqual(state["completed_tasks"], [])
@@ -9,16 +9,39 @@ import sys
 import time
 from pathlib import Path
 
+import pytest
+
 # Import all test modules
 sys.path.append(str(Path(__file__).parent))
 
-from test_command_execution import CommandExecutionTest
 from test_workflow_enforcement import WorkflowEnforcementTest
 from test_workflow_progression import WorkflowProgressionTest
-from test_complete_workflow import CompleteWorkflowTest
 from test_performance import HookPerformanceTest
 
 
+class PytestModuleSuite:
+    """Run a pytest-based test module as one suite."""
+    
+    module = None
+    
+    def run_tests(self):
+        """Run the module through pytest and report success."""
+        module = Path(__file__).parent / self.module
+        return pytest.main(['-q', str(module)]) == 0
+
+
+class CommandExecutionSuite(PytestModuleSuite):
+    """Run the pytest-based command execution tests."""
+    
+    module = 'test_command_execution.py'
+
+
+class CompleteWorkflowSuite(PytestModuleSuite):
+    """Run the pytest-based complete workflow tests."""
+    
+    module = 'test_complete_workflow.py'
+
+
 class Sprint3TestRunner:
     """Run all Sprint 3 integration tests."""
     
@@ -133,10 +156,10 @@ class Sprint3TestRunner:
         
         # Define test suites in execution order
         test_suites = [
-            (CommandExecutionTest, "Command Execution Tests"),
+            (CommandExecutionSuite, "Command Execution Tests"),
             (WorkflowEnforcementTest, "Workflow Enforcement Tests"),
             (WorkflowProgressionTest, "Workflow Progression Tests"),
-            (CompleteWorkflowTest, "Complete Workflow Tests"),
+            (CompleteWorkflowSuite, "Complete Workflow Tests"),
             (HookPerformanceTest, "Performance Tests")
         ]
         
@@ -15,12 +15,38 @@ from pathlib import Path
 from typing import Dict, Any, Optional, List, Tuple
 import sys
 
+# orjson parses bytes in C; fall back to the json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from src.state_manager import StateManager
 
 
+def tmp_root() -> Optional[str]:
+    """
+    Pick the parent directory for test scratch directories.
+    
+    CLAUDE_TEST_TMPDIR overrides the choice; set it empty to use the
+    system temp directory. Otherwise /dev/shm is used when writable, so
+    state file writes stay in memory instead of hitting the disk.
+    
+    Returns:
+        Directory path, or None for tempfile's default
+    """
+    override = os.environ.get('CLAUDE_TEST_TMPDIR')
+    if override is not None:
+        return override or None
+        
+    if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK):
+        return '/dev/shm'
+    return None
+
+
 class TestEnvironment:
     """Manages test environment setup and teardown."""
     
@@ -29,18 +55,21 @@ class TestEnvironment:
         self.test_dir = None
         self.original_cwd = os.getcwd()
         
-    def setup(self, project_name: str = "test-project") -> Path:
+    def setup(self, project_name: str = "test-project", 
+              base_dir: Optional[str] = None) -> Path:
         """
         Create test environment with git repo.
         
         Args:
             project_name: Name for test project
+            base_dir: Directory to create the test directory in (default: tmp_root())
             
         Returns:
             Path to test directory
         """
         # Create temporary directory
-        self.test_dir = tempfile.mkdtemp(prefix=f"claude_test_{project_name}_")
+        self.test_dir = tempfile.mkdtemp(prefix=f"claude_test_{project_name}_",
+                                         dir=base_dir or tmp_root())
         
         # Initialize git repo
         subprocess.run(['git', 'init'], cwd=self.test_dir, 
@@ -68,6 +97,20 @@ class TestEnvironment:
         os.chdir(self.original_cwd)
 
 
+def copy_skeleton(skeleton: Path, dest: Path):
+    """
+    Populate dest with a prebuilt project structure.
+    
+    Files are real copies, so tests may modify them in place without
+    affecting the skeleton or later tests.
+    
+    Args:
+        skeleton: Directory holding the prebuilt structure
+        dest: Test directory to populate
+    """
+    shutil.copytree(skeleton, dest, dirs_exist_ok=True)
+
+
 def setup_test_environment(project_name: str = "test-project") -> Path:
     """
     Quick setup for test environment.
@@ -144,28 +187,49 @@ def verify_project_structure(test_dir: Path) -> Dict[str, bool]:
     return results
 
 
-def read_project_state(test_dir: Path) -> Optional[Dict[str, Any]]:
+def read_project_state(test_dir: Path, state_file: Optional[Path] = None) -> Optional[Dict[str, Any]]:
     """
     Read project state safely.
     
     Args:
         test_dir: Test directory
+        state_file: Precomputed state file path (default: test_dir/.project-state.json)
         
     Returns:
         State dict or None if not found
     """
-    state_file = test_dir / '.project-state.json'
+    if state_file is None:
+        state_file = test_dir / '.project-state.json'
     if not state_file.exists():
         return None
         
     try:
-        with open(state_file, 'r') as f:
-            return json.load(f)
+        data = state_file.read_bytes()
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
     except:
         return None
 
 
-def update_project_state(test_dir: Path, updates: Dict[str, Any]) -> bool:
+def assert_state_matches(state: Optional[Dict[str, Any]], **expected: Any):
+    """
+    Assert that state has the expected value for each given field.
+    
+    Args:
+        state: State dict, e.g. from read_project_state
+        **expected: Field name -> expected value
+        
+    Raises:
+        AssertionError: On a missing state or the first mismatched field
+    """
+    assert state is not None, "State file missing or unreadable"
+    for key, value in expected.items():
+        actual = state.get(key)
+        assert actual == value, f"{key}: expected {value!r}, got {actual!r}"
+
+
+def update_project_state(test_dir: Path, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """
     Update project state for testing.
     
@@ -174,14 +238,13 @@ def update_project_state(test_dir: Path, updates: Dict[str, Any]) -> bool:
         updates: Fields to update
         
     Returns:
-        True if successful
+        The merged state that was written, or None on failure
     """
     try:
         state_manager = StateManager(test_dir)
-        state_manager.update(updates)
-        return True
+        return state_manager.update(updates)
     except:
-        return False
+        return None
 
 
 def simulate_claude_action(test_dir: Path, action_type: str, 
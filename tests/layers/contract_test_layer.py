@@ -86,6 +86,10 @@ class ContractTestLayer(TestLayer):
             if 'CACHE_AI_RESPONSES' not in env:
                 env['CACHE_AI_RESPONSES'] = context.config.get('cache_responses', True) and '1' or '0'
             
+            # The contract layer is the thorough lane, so validate schemas unless told otherwise
+            if 'AIFLOW_VALIDATE_SCHEMA' not in env:
+                env['AIFLOW_VALIDATE_SCHEMA'] = context.config.get('validate_schema', True) and '1' or '0'
+            
             # Add API keys if configured
             if context.config.get('api_key'):
                 env['CLAUDE_API_KEY'] = context.config['api_key']
@@ -4,16 +4,55 @@ MockClaudeProvider - Simulates Claude AI for integration testing.
 Provides predictable responses for testing AI-driven workflows.
 """
 
+import functools
 import json
 import time
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Mapping, Optional, Sequence, Tuple
 from pathlib import Path
+from types import MappingProxyType
 import re
 
+_ERROR_KEYWORDS = ("error", "debug", "exception", "analyze", "troubleshoot", "fix", "bug", "failure")
+
+
+@functools.lru_cache(maxsize=256)
+def _classify(prompt: str) -> str:
+    """Return the deterministic response kind for a prompt.
+    
+    Depends on the prompt text only, so repeated prompts skip the keyword scan.
+    """
+    prompt_lower = prompt.lower()
+    
+    # Project setup requests (check before general create patterns)
+    if ("setup" in prompt_lower or "set up" in prompt_lower or 
+        "create project" in prompt_lower or 
+        ("create" in prompt_lower and "project" in prompt_lower) or
+        ("new" in prompt_lower and "project" in prompt_lower) or
+        "initialize" in prompt_lower or "scaffold" in prompt_lower or
+        ("mkdir" in prompt_lower and len(prompt.split()) <= 3) or  # Handle simple mkdir commands
+        ("go module" in prompt_lower and "initialize" in prompt_lower)):
+        return "project_setup"
+    # Code review requests (check before implementation)
+    if "review" in prompt_lower or "check code" in prompt_lower:
+        return "code_review"
+    if any(keyword in prompt_lower for keyword in ["implement", "create", "generate", "write"]) or "class" in prompt_lower or "function" in prompt_lower:
+        return "code_implementation"
+    if "refactor" in prompt_lower or "improve" in prompt_lower or "clean" in prompt_lower:
+        return "refactoring"
+    if any(keyword in prompt_lower for keyword in _ERROR_KEYWORDS):
+        return "error_analysis"
+    # Minimal code generation (e.g., "x = 1")
+    if "=" in prompt and len(prompt) < 50:
+        return "code_generation"
+    return "general"
+
 
 class MockClaudeProvider:
     """Mock implementation of Claude AI for testing"""
     
+    # Fixed attribute set: no per-instance __dict__ on the query path
+    __slots__ = ("response_mode", "debug", "call_history", "response_templates", "custom_responses")
+    
     def __init__(self, response_mode: str = "deterministic"):
         """
         Initialize mock provider.
@@ -69,6 +108,17 @@ class MockClaudeProvider:
         Returns:
             Mock response dictionary
         """
+        response, call_record = self._respond(prompt, context)
+        if call_record is not None:
+            self.call_history.append(call_record)
+        
+        return response
+        
+    def _respond(self, prompt: str, context: Optional[Dict[str, Any]]) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """Build the response and its call record without touching history.
+        
+        The record is None for rejected prompts, which are not recorded.
+        """
         # Validate prompt length
         MAX_PROMPT_LENGTH = 10000
         if len(prompt) > MAX_PROMPT_LENGTH:
@@ -76,7 +126,7 @@ class MockClaudeProvider:
                 "type": "error",
                 "error": f"Prompt too long: {len(prompt)} characters (max {MAX_PROMPT_LENGTH})",
                 "message": "Please reduce the prompt length"
-            }
+            }, None
         # Record the call
         call_record = {
             "timestamp": time.time(),
@@ -94,13 +144,13 @@ class MockClaudeProvider:
             response = self._generate_deterministic_response(prompt, context)
             
         call_record["response"] = response
-        self.call_history.append(call_record)
         
-        return response
+        return response, call_record
         
     def _generate_deterministic_response(self, prompt: str, context: Optional[Dict[str, Any]]) -> Dict[str, Any]:
         """Generate predictable response based on prompt patterns"""
         prompt_lower = prompt.lower()
+        kind = _classify(prompt)
         
         # Debug logging
         if self.debug:
@@ -108,13 +158,7 @@ class MockClaudeProvider:
             print(f"DEBUG MockClaudeProvider: Context: {context}")
         
         # Project setup requests (check before general create patterns)
-        if ("setup" in prompt_lower or "set up" in prompt_lower or 
-            "create project" in prompt_lower or 
-            ("create" in prompt_lower and "project" in prompt_lower) or
-            ("new" in prompt_lower and "project" in prompt_lower) or
-            "initialize" in prompt_lower or "scaffold" in prompt_lower or
-            ("mkdir" in prompt_lower and len(prompt.split()) <= 3) or  # Handle simple mkdir commands
-            ("go module" in prompt_lower and "initialize" in prompt_lower)):
+        if kind == "project_setup":
             
             # Handle simple mkdir command
             if "mkdir" in prompt_lower and len(prompt.split()) <= 3:
@@ -189,7 +233,7 @@ class MockClaudeProvider:
             }
             
         # Code review requests (check before implementation)
-        elif "review" in prompt_lower or "check code" in prompt_lower:
+        elif kind == "code_review":
             # Basic issues from template
             issues = self.response_templates["code_review"]["issues"].copy()
             
@@ -220,7 +264,7 @@ class MockClaudeProvider:
             }
             
         # Code implementation requests
-        elif any(keyword in prompt_lower for keyword in ["implement", "create", "generate", "write"]) or "class" in prompt_lower or "function" in prompt_lower:
+        elif kind == "code_implementation":
             # Extract function/class name from prompt
             func_match = re.search(r"function\s+(\w+)", prompt)
             class_match = re.search(r"class\s+(?:for\s+)?(?:a\s+)?(\w+)", prompt)
@@ -298,7 +342,7 @@ class MockClaudeProvider:
             }
             
         # Refactoring requests
-        elif "refactor" in prompt_lower or "improve" in prompt_lower or "clean" in prompt_lower:
+        elif kind == "refactoring":
             # Extract code from context if available
             code_to_refactor = ""
             if context and "code" in context:
@@ -333,7 +377,7 @@ class MockClaudeProvider:
             }
             
         # Error analysis requests  
-        elif any(keyword in prompt_lower for keyword in ["error", "debug", "exception", "analyze", "troubleshoot", "fix", "bug", "failure"]):
+        elif kind == "error_analysis":
             # Determine error type from context or prompt content
             error_type = "type"  # default
             if context and "error_type" in context:
@@ -365,7 +409,7 @@ class MockClaudeProvider:
             }
             
         # Minimal code generation (e.g., "x = 1")
-        elif "=" in prompt and len(prompt) < 50:
+        elif kind == "code_generation":
             return {
                 "type": "code_generation",
                 "code": prompt.strip(),
@@ -475,6 +519,8 @@ class MockClaudeProvider:
 class MockClaudeProviderWithState(MockClaudeProvider):
     """Extended mock provider that maintains state across calls"""
     
+    __slots__ = ("state",)
+    
     def __init__(self, response_mode: str = "deterministic"):
         super().__init__(response_mode)
         self.state = {
@@ -497,6 +543,36 @@ class MockClaudeProviderWithState(MockClaudeProvider):
         
         return response
         
+    def query_many(self, prompts: Sequence[Tuple[str, Optional[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+        """
+        Process a batch of queries in order.
+        
+        Each query sees the state left by the previous one, as with repeated
+        query() calls, but the call history is extended once for the batch.
+        
+        Args:
+            prompts: (prompt, context) pairs
+            
+        Returns:
+            Responses in the same order as prompts
+        """
+        update_state = self._update_state
+        respond = self._respond
+        state = self.state
+        responses = []
+        records = []
+        
+        for prompt, context in prompts:
+            update_state(prompt, context)
+            response, call_record = respond(prompt, context)
+            response["state"] = state.copy()
+            responses.append(response)
+            if call_record is not None:
+                records.append(call_record)
+                
+        self.call_history.extend(records)
+        return responses
+        
     def _update_state(self, prompt: str, context: Optional[Dict[str, Any]]):
         """Update internal state based on interactions"""
         prompt_lower = prompt.lower()
@@ -526,6 +602,10 @@ class MockClaudeProviderWithState(MockClaudeProvider):
         """Get current state"""
         return self.state.copy()
         
+    def peek_state(self) -> Mapping[str, Any]:
+        """Get a read-only live view of the state, without copying"""
+        return MappingProxyType(self.state)
+        
     def reset_state(self):
         """Reset state to initial values"""
         self.state = {
@@ -7,9 +7,18 @@ echo "================================"
 # Ensure we're in the project root
 cd "$(dirname "$0")/.." || exit 1
 
-# Run all integration tests
-echo "Running integration tests with unittest discover..."
-python3 -m unittest discover -s tests/integration -p "test_*.py" -v
+# Spread tests across CPUs when pytest-xdist is installed; each worker
+# gets its own session fixtures and temporary directories. loadscope keeps
+# a module's or class's tests on one worker so shared fixtures and
+# setUpClass run once per scope instead of once per worker
+PARALLEL_ARGS=()
+if python3 -c "import xdist" 2>/dev/null; then
+    PARALLEL_ARGS=(-n auto --dist=loadscope)
+fi
+
+# Run all integration tests (pytest also collects the unittest suites)
+echo "Running integration tests with pytest ${PARALLEL_ARGS[*]}..."
+python3 -m pytest tests/integration -v "${PARALLEL_ARGS[@]}"
 
 # Capture exit code
 EXIT_CODE=$?
@@ -18,7 +18,7 @@ from datetime import datetime, timezone
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from src.commands.lifecycle import LifecycleCommand, LifecycleCommandError
+from src.commands.lifecycle import LifecycleCommand, LifecycleCommandError, execute_command
 from src.state_manager import StateValidationError
 
 
@@ -595,6 +595,23 @@ class TestLifecycleCommand(unittest.TestCase):
             cmd.start()
             
         self.assertIn("Start operation failed", str(context.exception))
+        
+    def test_execute_command_dispatches_pause_with_reason(self):
+        """Test in-process dispatch joins args into the pause reason."""
+        with patch.object(LifecycleCommand, 'pause') as mock_pause:
+            exit_code = execute_command("pause", ["taking", "a", "break"], str(self.project_path))
+            
+        self.assertEqual(exit_code, 0)
+        mock_pause.assert_called_once_with("taking a break")
+        
+    def test_execute_command_failure_exit_codes(self):
+        """Test in-process dispatch reports failures as exit code 1."""
+        with patch('builtins.print'):
+            self.assertEqual(execute_command("bogus", None, str(self.project_path)), 1)
+            
+            with patch.object(LifecycleCommand, 'start',
+                              side_effect=LifecycleCommandError("not ready")):
+                self.assertEqual(execute_command("start", None, str(self.project_path)), 1)
 
 
 if __name__ == '__main__':
@@ -3,6 +3,9 @@
 Unit tests for pre_tool_use hook using subprocess for complete isolation.
 """
 
+import json
+import os
+import subprocess
 import pytest
 from pathlib import Path
 import sys
@@ -282,6 +285,35 @@ class TestPreToolUseHook(SubprocessHookTestBase):
         assert final_state['metrics']['tools_allowed'] == 1
         assert final_state['metrics']['tools_blocked'] == 2
 
+    
+    def test_batch_mode_handles_events_in_order(self, event_fixtures):
+        """Test --batch mode answers one line per event and shares state."""
+        state = self.default_state()
+        state['workflow_step'] = 'planning'
+        self.create_state_file(state)
+        
+        events = [event_fixtures['write_event'], event_fixtures['read_event']]
+        result = subprocess.run(
+            [sys.executable, str(self.pre_tool_use_hook), '--batch'],
+            input='\n'.join(json.dumps(event) for event in events) + '\nnot json\n',
+            capture_output=True,
+            text=True,
+            cwd=str(self.project_dir),
+            env={**os.environ, 'PYTHONPATH': str(Path(__file__).parent.parent.parent)}
+        )
+        
+        responses = [json.loads(line) for line in result.stdout.splitlines()]
+        assert len(responses) == 3
+        self.assert_blocked(responses[0])
+        self.assert_allowed(responses[1])
+        self.assert_allowed(responses[2])  # Errors allow but log
+        assert 'Invalid JSON' in responses[2].get('message', '')
+        
+        # Metrics accumulate across the batch
+        final_state = self.read_state_file()
+        assert final_state['metrics']['tools_allowed'] == 1
+        assert final_state['metrics']['tools_blocked'] == 1
+
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
\ No newline at end of file
@@ -123,6 +123,24 @@ class TestProjectBuilder(unittest.TestCase):
             
             
         
+    def test_create_gitignore_ignores_lock_sidecar(self):
+        """Test that the state lock sidecar is ignored exactly once."""
+        self.project_builder._create_gitignore()
+        self.project_builder._create_gitignore()
+        
+        lines = (self.worktree_path / ".gitignore").read_text().splitlines()
+        self.assertEqual(lines.count("/.project-state.json.lock"), 1)
+        
+    def test_create_gitignore_keeps_existing_entries(self):
+        """Test that an existing .gitignore is appended to, not replaced."""
+        gitignore_path = self.worktree_path / ".gitignore"
+        gitignore_path.write_text("node_modules/")
+        
+        self.project_builder._create_gitignore()
+        
+        self.assertEqual(gitignore_path.read_text().splitlines(),
+                         ["node_modules/", "/.project-state.json.lock"])
+        
     def test_create_project_structure_failure(self):
         """Test project structure creation failure handling."""
         # TODO: This test needs to be updated based on actual error handling
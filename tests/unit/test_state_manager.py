@@ -11,13 +11,16 @@ import shutil
 import json
 import sys
 import os
+import subprocess
 from pathlib import Path
+from unittest.mock import patch
 from datetime import datetime, timezone
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from src.state_manager import StateManager, StateValidationError
+from src import state_manager as state_manager_module
+from src.state_manager import FileLock, StateManager, StateValidationError
 
 
 class TestStateManager(unittest.TestCase):
@@ -72,6 +75,75 @@ class TestStateManager(unittest.TestCase):
         
         self.assertEqual(original, loaded)
         
+    def test_repeated_reads_return_independent_copies(self):
+        """Test that cached reads can be mutated without affecting later reads."""
+        self.manager.create("test-project")
+        
+        first = self.manager.read()
+        first["completed_sprints"].append("99")
+        second = self.manager.read()
+        
+        self.assertEqual(second["completed_sprints"], [])
+        
+    def test_read_sees_external_writes(self):
+        """Test that a write through another manager invalidates the read cache."""
+        self.manager.create("test-project")
+        self.manager.read()
+        
+        StateManager(self.test_dir).update({"status": "active"})
+        
+        self.assertEqual(self.manager.read()["status"], "active")
+        
+    def test_update_keeps_external_writes(self):
+        """Test that update merges onto the file, not a stale cached state."""
+        self.manager.create("test-project")
+        self.manager.update({"status": "active"})
+        
+        StateManager(self.test_dir).update({"automation_cycles": 4})
+        updated_state = self.manager.update({"workflow_step": "review"})
+        
+        self.assertEqual(updated_state["automation_cycles"], 4)
+        self.assertEqual(updated_state["status"], "active")
+        
+    def test_read_does_not_wait_for_writer_lock(self):
+        """Test that reads proceed while another process holds the write lock."""
+        self.manager.create("test-project")
+        
+        with FileLock(self.manager.state_file, timeout=0.05):
+            state = StateManager(self.test_dir).read()
+            
+        self.assertEqual(state["project_name"], "test-project")
+        
+    def _rewrite_status_keeping_stat(self, old_status, new_status):
+        """Rewrite status in place with the same inode, size and mtime."""
+        st = os.stat(self.manager.state_file)
+        data = self.manager.state_file.read_bytes()
+        new_data = data.replace(f'"status": "{old_status}"'.encode(),
+                                f'"status": "{new_status}"'.encode())
+        self.assertEqual(len(new_data), len(data))
+        with open(self.manager.state_file, 'r+b') as f:
+            f.write(new_data)
+        os.utime(self.manager.state_file, ns=(st.st_atime_ns, st.st_mtime_ns))
+        
+    def test_update_sees_write_with_unchanged_stat(self):
+        """Test that update re-reads a file rewritten with an identical stat."""
+        self.manager.create("test-project")
+        self.manager.read()
+        
+        self._rewrite_status_keeping_stat("setup", "error")
+        updated_state = self.manager.update({"automation_cycles": 1})
+        
+        self.assertEqual(updated_state["status"], "error")
+        
+    def test_read_sees_write_with_unchanged_stat(self):
+        """Test that read does not serve the cache for a file with an identical stat."""
+        self.manager.create("test-project")
+        self.manager.read()
+        
+        self._rewrite_status_keeping_stat("setup", "error")
+        
+        self.assertEqual(self.manager.read()["status"], "error")
+        
     def test_read_nonexistent_state_fails(self):
         """Test reading non-existent state file fails."""
         with self.assertRaises(StateValidationError) as context:
@@ -102,6 +174,53 @@ class TestStateManager(unittest.TestCase):
         original_timestamp = self.manager.read()["last_updated"]
         self.assertEqual(updated_state["last_updated"], original_timestamp)
         
+    def test_update_batch_applies_updates_in_order(self):
+        """Test that batched updates are applied in order with one write."""
+        self.manager.create("test-project")
+        
+        updated_state = self.manager.update_batch([
+            {"status": "active", "automation_cycles": 1},
+            {"automation_cycles": 2, "workflow_step": "implementation"}
+        ])
+        
+        self.assertEqual(updated_state["status"], "active")
+        self.assertEqual(updated_state["automation_cycles"], 2)
+        self.assertEqual(updated_state["workflow_step"], "implementation")
+        self.assertEqual(self.manager.read(), updated_state)
+        
+    def test_update_batch_invalid_update_writes_nothing(self):
+        """Test that one invalid update in a batch leaves the state unchanged."""
+        original_state = self.manager.create("test-project")
+        
+        with self.assertRaises(StateValidationError):
+            self.manager.update_batch([
+                {"automation_cycles": 3},
+                {"status": "invalid-status"}
+            ])
+            
+        self.assertEqual(self.manager.read(), original_state)
+        
+    def test_update_with_unserializable_value_fails(self):
+        """Test that a value JSON cannot encode raises StateValidationError."""
+        original_state = self.manager.create("test-project")
+        
+        with self.assertRaises(StateValidationError):
+            self.manager.update({"metrics": object()})
+            
+        self.assertEqual(self.manager.read(), original_state)
+        
+    @unittest.skipIf(state_manager_module.orjson is None, "orjson not installed")
+    def test_orjson_and_json_write_identical_files(self):
+        """Test that both serializers produce the same state file bytes."""
+        state = self.manager.create("café-project")
+        
+        with_orjson = state_manager_module._dumps_state(state)
+        with patch.object(state_manager_module, 'orjson', None):
+            with_json = state_manager_module._dumps_state(state)
+            
+        self.assertEqual(with_orjson, with_json)
+        self.assertEqual(self.manager.state_file.read_bytes(), with_orjson)
+        
     def test_update_with_invalid_status_fails(self):
         """Test updating with invalid status value fails."""
         self.manager.create("test-project")
@@ -246,5 +365,51 @@ class TestStateManager(unittest.TestCase):
         self.assertIsInstance(state["git_worktree"], str)
 
 
+
+class TestFileLock(unittest.TestCase):
+    """Test FileLock acquisition and release."""
+    
+    def setUp(self):
+        """Set up a temporary file to lock."""
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.target = self.test_dir / "state.json"
+        
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.test_dir)
+        
+    def test_held_lock_times_out(self):
+        """Test that a second lock on a held file raises TimeoutError."""
+        with FileLock(self.target):
+            with self.assertRaises(TimeoutError):
+                with FileLock(self.target, timeout=0.05):
+                    pass
+                    
+    def test_lock_reacquired_after_release(self):
+        """Test that a released lock can be taken again immediately."""
+        with FileLock(self.target):
+            pass
+            
+        lock = FileLock(self.target, timeout=0.05)
+        with lock:
+            self.assertIsNotNone(lock.lock_fd)
+        self.assertIsNone(lock.lock_fd)
+
+        
+    def test_stale_sidecar_does_not_block(self):
+        """Test that a sidecar left by a process that died holding the lock is reusable."""
+        code = (
+            "import os, sys; sys.path.insert(0, sys.argv[1]);"
+            "from pathlib import Path; from src.state_manager import FileLock;"
+            "FileLock(Path(sys.argv[2])).__enter__(); os._exit(0)"
+        )
+        project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+        subprocess.run([sys.executable, '-c', code, project_root, str(self.target)], check=True)
+        self.assertTrue(Path(str(self.target) + '.lock').exists())
+        
+        lock = FileLock(self.target, timeout=0.05)
+        with lock:
+            self.assertIsNotNone(lock.lock_fd)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file